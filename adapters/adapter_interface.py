@@ -48,6 +48,11 @@ class AdapterInterface(ABC):
         """Register command"""
         pass
 
+    def add_commands(self, commands: Dict[str, Callable]) -> None:
+        """Register several commands at once"""
+        for name, handler in commands.items():
+            self.add_command(name, handler)
+
     @abstractmethod
     def on_event(self, event_name: str):
         """Register event listener"""
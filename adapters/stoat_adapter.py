@@ -7,6 +7,7 @@ import difflib
 import json
 import logging
 import shlex
+import sys
 import aiohttp
 import asyncio
 import websockets
@@ -171,9 +172,17 @@ class StoatAdapter(AdapterInterface):
 
     def add_command(self, name: str, handler: Callable) -> None:
         """Register command handler"""
-        self._commands[name.lower()] = handler
+        # Interned: these keys are looked up on every dispatched message
+        self._commands[sys.intern(name.lower())] = handler
         logger.debug(f"Command registered: {name}")
 
+    def add_commands(self, commands: Dict[str, Callable]) -> None:
+        """Register a batch of command handlers with a single dict update"""
+        self._commands.update(
+            {sys.intern(name.lower()): handler for name, handler in commands.items()}
+        )
+        logger.debug(f"Commands registered: {len(commands)}")
+
     def on_event(self, event_name: str):
         """Register event listener decorator"""
         def decorator(handler):
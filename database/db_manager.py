@@ -3,16 +3,142 @@ Database Manager - Stoat-only MongoDB manager
 Pure async with Motor (no Discord)
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from motor.core import AgnosticDatabase
 import pymongo
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, ExecutionTimeout, PyMongoError
+
+from utils.permissions import PermissionChecker
 
 logger = logging.getLogger(__name__)
 
+# Only the fields leaderboard embeds render; all of them live in the users index
+_LEADERBOARD_PROJECTION = {"user_id": 1, "balance": 1, "_id": 0}
+
+# Leaderboards are served from per-guild snapshots rebuilt in the background
+LEADERBOARD_SNAPSHOT_SIZE = 100
+LEADERBOARD_REFRESH_INTERVAL = 600
+
+
+class XPFirehose:
+    """Coalesces $inc updates on a collection into periodic bulk_write calls
+
+    Increments for the same (user_id, guild_id) are summed while pending, so a
+    chatty user costs one UpdateOne per flush instead of one round trip per
+    message. Pending work is flushed after flush_delay seconds, or as soon as
+    max_pending documents are queued.
+
+    Batches that fail transiently (network errors, timeouts) are retried up
+    to max_retries times per document; per-document write errors would fail
+    the same way again, so those increments are logged and dropped.
+    """
+
+    def __init__(self, collection, flush_delay: float = 0.05, max_pending: int = 500, max_retries: int = 3):
+        self.collection = collection
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self._pending: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def add(self, user_id: str, guild_id: str, field: str, amount: int) -> None:
+        """Queue an increment of field by amount"""
+        incs = self._pending.setdefault((user_id, guild_id), {})
+        incs[field] = incs.get(field, 0) + amount
+
+        if len(self._pending) >= self.max_pending and not self._flushing:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_delay, self._start_flush)
+
+    @property
+    def _flushing(self) -> bool:
+        return self._flush_task is not None and not self._flush_task.done()
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        if self._flushing:
+            # One flush at a time; pick up what queued meanwhile once it's done
+            self._timer = asyncio.get_running_loop().call_later(self.flush_delay, self._start_flush)
+            return
+        self._flush_task = asyncio.ensure_future(self.flush())
+
+    def _requeue(self, pending: Dict[Tuple[str, str], Dict[str, int]]) -> None:
+        """Merge unwritten increments back into the pending set, up to max_retries times per document"""
+        dropped = 0
+        for key, incs in pending.items():
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts > self.max_retries:
+                del self._attempts[key]
+                dropped += 1
+                continue
+            self._attempts[key] = attempts
+            merged = self._pending.setdefault(key, {})
+            for field, amount in incs.items():
+                merged[field] = merged.get(field, 0) + amount
+        if dropped:
+            logger.error(f"Dropped batched increments for {dropped} documents after {self.max_retries} retries")
+
+    def _settle(self, pending: Dict[Tuple[str, str], Dict[str, int]]) -> None:
+        """Forget retry counts for documents that are written or dropped"""
+        if self._attempts:
+            for key in pending:
+                self._attempts.pop(key, None)
+
+    async def flush(self) -> None:
+        """Write all pending increments in one unordered bulk_write"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        ops = [
+            UpdateOne({"user_id": user_id, "guild_id": guild_id}, {"$inc": incs})
+            for (user_id, guild_id), incs in pending.items()
+        ]
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every other operation was applied. A write error (e.g.
+            # $inc on a non-numeric field) fails the same way on retry, and a
+            # write concern error means the increments already reached the
+            # primary, so nothing is requeued either way
+            errors = e.details.get("writeErrors", [])
+            logger.error(f"Dropped {len(errors)} of {len(ops)} batched increments: {errors[:3]}")
+            self._settle(pending)
+        except (ConnectionFailure, ExecutionTimeout) as e:
+            logger.warning(f"Batched increment flush failed ({len(ops)} ops), will retry: {e}")
+            self._requeue(pending)
+        except PyMongoError as e:
+            if e.has_error_label("RetryableWriteError"):
+                logger.warning(f"Batched increment flush failed ({len(ops)} ops), will retry: {e}")
+                self._requeue(pending)
+            else:
+                logger.error(f"Dropped {len(ops)} batched increments: {e}")
+                self._settle(pending)
+        except Exception as e:
+            logger.error(f"Dropped {len(ops)} batched increments: {e}")
+            self._settle(pending)
+        else:
+            self._settle(pending)
+
+    async def drain(self) -> None:
+        """Wait for a running flush, then write anything still pending"""
+        if self._flushing:
+            await self._flush_task
+        await self.flush()
+
 
 class DatabaseManager:
     """Async MongoDB database manager with Stoat schema support"""
@@ -23,14 +149,21 @@ class DatabaseManager:
         self.pool_size = pool_size
         self.client: Optional[AsyncIOMotorClient] = None
         self.db: Optional[AsyncDatabase] = None
+        self._xp_firehose: Optional[XPFirehose] = None
+        self._leaderboard_guilds: set = set()
+        self._leaderboard_task: Optional[asyncio.Task] = None
+        self._background_tasks: set = set()
 
     async def connect(self) -> None:
         """Establish database connection"""
         try:
+            # Keep a quarter of the pool warm so infrequent guilds skip the
+            # TCP/TLS/auth handshake; drop connections idle for over a minute
             self.client = AsyncIOMotorClient(
                 self.uri,
                 maxPoolSize=self.pool_size,
-                minPoolSize=1
+                minPoolSize=max(1, self.pool_size // 4),
+                maxIdleTimeMS=60000
             )
             self.db = self.client[self.database_name]
 
@@ -41,6 +174,8 @@ class DatabaseManager:
             # Create indexes
             await self._create_indexes()
 
+            self._leaderboard_task = asyncio.create_task(self._refresh_leaderboards())
+
         except Exception as e:
             logger.error(f"Database connection failed: {e}", exc_info=True)
             raise
@@ -50,16 +185,21 @@ class DatabaseManager:
         try:
             # Users collection
             await self.db.users.create_index([("user_id", 1), ("guild_id", 1)], unique=True)
-            await self.db.users.create_index([("guild_id", 1)])
+            # Covers get_leaderboard (filter, sort and projection); also serves guild_id-only lookups
+            await self.db.users.create_index([("guild_id", 1), ("balance", -1), ("user_id", 1)])
+
+            # Leaderboard snapshots ($merge target, one document per guild)
+            await self.db.leaderboard_snapshots.create_index([("guild_id", 1)], unique=True)
 
-            # Guilds collection
+            # Guilds collection (also serves /guilds' sort("guild_id").skip().limit() pages)
             await self.db.guilds.create_index([("guild_id", 1)], unique=True)
 
             # Members collection
             await self.db.members.create_index([("guild_id", 1), ("user_id", 1)], unique=True)
+            await self.db.members.create_index([("guild_id", 1), ("roles", 1)])
 
-            # Moderation logs
-            await self.db.moderation_actions.create_index([("guild_id", 1)])
+            # Moderation logs (compound index serves get_user_actions' filter and sort)
+            await self.db.moderation_actions.create_index([("guild_id", 1), ("target_id", 1), ("timestamp", -1)])
             await self.db.moderation_actions.create_index([("target_id", 1)])
 
             # Tickets
@@ -76,6 +216,9 @@ class DatabaseManager:
 
     async def disconnect(self) -> None:
         """Close database connection"""
+        if self._leaderboard_task:
+            self._leaderboard_task.cancel()
+        await self.flush_writes()
         if self.client:
             self.client.close()
             logger.info("Database disconnected")
@@ -125,16 +268,71 @@ class DatabaseManager:
         return result.modified_count > 0
 
     async def add_xp(self, user_id: str, guild_id: str, amount: int) -> bool:
-        """Add XP to user"""
-        result = await self.db.users.update_one(
-            {"user_id": user_id, "guild_id": guild_id},
-            {"$inc": {"xp": amount}}
-        )
-        return result.modified_count > 0
+        """Add XP to user
+
+        XP is awarded on every chat message, so the increment is queued and
+        written in batches. Fire-and-forget: always returns True once queued,
+        so the result says nothing about the write itself. Failed batches are
+        logged by XPFirehose; call flush_writes() to push queued XP out now.
+        """
+        if self._xp_firehose is None:
+            self._xp_firehose = XPFirehose(self.db.users)
+        self._xp_firehose.add(user_id, guild_id, "xp", amount)
+        return True
+
+    async def flush_writes(self) -> None:
+        """Write any queued batched increments now"""
+        if self._xp_firehose is not None:
+            await self._xp_firehose.drain()
 
     async def get_leaderboard(self, guild_id: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get top users by balance"""
-        return await self.db.users.find({"guild_id": guild_id}).sort("balance", -1).limit(limit).to_list(length=limit)
+        """Get top users by balance
+
+        Reads the guild's snapshot; the first request for a guild falls back
+        to a live query and schedules the guild for background refreshes.
+        """
+        tracked = guild_id in self._leaderboard_guilds
+        self._leaderboard_guilds.add(guild_id)
+        if limit <= LEADERBOARD_SNAPSHOT_SIZE:
+            snapshot = await self.db.leaderboard_snapshots.find_one(
+                {"guild_id": guild_id},
+                {"entries": {"$slice": limit}, "_id": 0}
+            )
+            if snapshot is not None:
+                return snapshot["entries"]
+
+        if not tracked:
+            # Keep a reference so the task isn't collected mid-run
+            task = asyncio.create_task(self.refresh_leaderboard(guild_id))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        return await self.db.users.find(
+            {"guild_id": guild_id},
+            _LEADERBOARD_PROJECTION
+        ).sort("balance", -1).limit(limit).to_list(length=limit)
+
+    async def refresh_leaderboard(self, guild_id: str) -> None:
+        """Rebuild a guild's leaderboard snapshot server-side"""
+        pipeline = [
+            {"$match": {"guild_id": guild_id}},
+            {"$sort": {"balance": -1}},
+            {"$limit": LEADERBOARD_SNAPSHOT_SIZE},
+            {"$group": {"_id": "$guild_id", "entries": {"$push": {"user_id": "$user_id", "balance": "$balance"}}}},
+            {"$project": {"_id": 0, "guild_id": "$_id", "entries": 1, "refreshed_at": "$$NOW"}},
+            {"$merge": {"into": "leaderboard_snapshots", "on": "guild_id", "whenMatched": "replace"}}
+        ]
+        try:
+            await self.db.users.aggregate(pipeline).to_list(length=None)
+        except Exception as e:
+            logger.error(f"Leaderboard refresh failed for {guild_id}: {e}")
+
+    async def _refresh_leaderboards(self) -> None:
+        """Background task: rebuild snapshots for every guild that has been read"""
+        while True:
+            await asyncio.sleep(LEADERBOARD_REFRESH_INTERVAL)
+            for guild_id in list(self._leaderboard_guilds):
+                await self.refresh_leaderboard(guild_id)
 
     # ========== MEMBER OPERATIONS ==========
     async def get_member(self, guild_id: str, user_id: str) -> Optional[Dict[str, Any]]:
@@ -144,6 +342,13 @@ class DatabaseManager:
             "user_id": user_id
         })
 
+    async def get_members(self, guild_id: str, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several member documents in a single query"""
+        return await self.db.members.find({
+            "guild_id": guild_id,
+            "user_id": {"$in": list(user_ids)}
+        }).to_list(length=len(user_ids))
+
     async def create_member(self, guild_id: str, user_id: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Create member document"""
         member_doc = {
@@ -157,6 +362,7 @@ class DatabaseManager:
         }
 
         await self.db.members.insert_one(member_doc)
+        PermissionChecker.invalidate(guild_id, user_id)
         return member_doc
 
     async def update_member(self, guild_id: str, user_id: str, data: Dict[str, Any]) -> bool:
@@ -165,6 +371,7 @@ class DatabaseManager:
             {"guild_id": guild_id, "user_id": user_id},
             {"$set": data}
         )
+        PermissionChecker.invalidate(guild_id, user_id)
         return result.modified_count > 0
 
     async def add_member_role(self, guild_id: str, user_id: str, role_id: str) -> bool:
@@ -173,6 +380,7 @@ class DatabaseManager:
             {"guild_id": guild_id, "user_id": user_id},
             {"$addToSet": {"roles": role_id}}
         )
+        PermissionChecker.invalidate(guild_id, user_id)
         return result.modified_count > 0
 
     async def remove_member_role(self, guild_id: str, user_id: str, role_id: str) -> bool:
@@ -181,6 +389,7 @@ class DatabaseManager:
             {"guild_id": guild_id, "user_id": user_id},
             {"$pull": {"roles": role_id}}
         )
+        PermissionChecker.invalidate(guild_id, user_id)
         return result.modified_count > 0
 
     # ========== GUILD OPERATIONS ==========
@@ -203,6 +412,7 @@ class DatabaseManager:
         }
 
         await self.db.guilds.insert_one(guild_doc)
+        PermissionChecker.invalidate(guild_id)
         return guild_doc
 
     async def update_guild(self, guild_id: str, data: Dict[str, Any]) -> bool:
@@ -211,6 +421,8 @@ class DatabaseManager:
             {"guild_id": guild_id},
             {"$set": data}
         )
+        if "owner_id" in data:
+            PermissionChecker.invalidate(guild_id)
         return result.modified_count > 0
 
     # ========== ROLE OPERATIONS ==========
@@ -5,13 +5,110 @@ Health Check Server - Stoat bot health monitoring
 import json
 import logging
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import socket
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional, Tuple
+
+from utils.timestamps import utc_now_iso
 
 logger = logging.getLogger(__name__)
 
-bot_instance = None
+
+@lru_cache(maxsize=None)
+def _env() -> str:
+    """Deployment environment (fixed for the life of the process)"""
+    return os.getenv("ENVIRONMENT", "development")
+
+
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+@dataclass
+class HealthProbes:
+    """Health check callables, resolved once against the bot instance"""
+    bot: Callable[[], dict]
+    database: Callable[[], dict]
+    adapter: Callable[[], dict]
+    cogs: Callable[[], dict]
+    uptime: Callable[[], Optional[float]]
+    cogs_count: Callable[[], int]
+
+
+def _connection_probes(bot) -> Tuple[Callable[[], dict], Callable[[], dict]]:
+    """(bot, adapter) probes"""
+    if not (bot and hasattr(bot, 'adapter')):
+        return (
+            lambda: {"status": "unhealthy", "error": "Bot not initialized"},
+            lambda: {"status": "unhealthy", "error": "No adapter"},
+        )
+
+    def bot_probe() -> dict:
+        connected = bool(bot.adapter and bot.adapter.is_connected())
+        return {
+            "status": "healthy" if connected else "unhealthy",
+            "connected": connected
+        }
+
+    def adapter_probe() -> dict:
+        return {
+            "status": "healthy" if bot.adapter else "unhealthy",
+            "adapter": "Stoat"
+        }
+
+    return bot_probe, adapter_probe
+
+
+def _database_probe(bot) -> Callable[[], dict]:
+    if not (bot and hasattr(bot, 'db')):
+        return lambda: {"status": "unhealthy", "error": "Database not initialized"}
+
+    def database_probe() -> dict:
+        db = bot.db
+        if db is None:
+            return {"status": "unhealthy", "error": "Database not initialized"}
+        connected = db.is_connected
+        return {
+            "status": "healthy" if connected else "unhealthy",
+            "connected": connected
+        }
+
+    return database_probe
+
+
+def _cogs_probes(bot) -> Tuple[Callable[[], dict], Callable[[], int]]:
+    """(cogs, cogs_count) probes"""
+    if not (bot and hasattr(bot, 'loaded_cogs')):
+        return lambda: {"status": "unknown", "cogs_loaded": 0}, lambda: 0
+    return (
+        lambda: {"status": "healthy", "cogs_loaded": len(bot.loaded_cogs)},
+        lambda: len(bot.loaded_cogs),
+    )
+
+
+def _uptime_probe(bot) -> Callable[[], Optional[float]]:
+    if not (bot and hasattr(bot, 'start_time')):
+        return lambda: None
+    return lambda: (datetime.utcnow() - bot.start_time).total_seconds()
+
+
+def _resolve_probes(bot) -> HealthProbes:
+    """Introspect the bot once so request handling needs no hasattr checks"""
+    bot_probe, adapter_probe = _connection_probes(bot)
+    cogs_probe, cogs_count = _cogs_probes(bot)
+    return HealthProbes(
+        bot=bot_probe,
+        database=_database_probe(bot),
+        adapter=adapter_probe,
+        cogs=cogs_probe,
+        uptime=_uptime_probe(bot),
+        cogs_count=cogs_count,
+    )
+
+
+probes = _resolve_probes(None)
 
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
@@ -32,12 +129,12 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         try:
             health_status = {
                 "status": "healthy",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utc_now_iso(),
                 "checks": {
-                    "bot": self._check_bot(),
-                    "database": self._check_database(),
-                    "adapter": self._check_adapter(),
-                    "cogs": self._check_cogs()
+                    "bot": probes.bot(),
+                    "database": probes.database(),
+                    "adapter": probes.adapter(),
+                    "cogs": probes.cogs()
                 }
             }
 
@@ -50,10 +147,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
                 health_status["status"] = "degraded"
                 status_code = 503
 
-            self.send_response(status_code)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(health_status, indent=2).encode())
+            self._send_json(status_code, health_status)
 
         except Exception as e:
             logger.error(f"Health check error: {e}")
@@ -63,88 +157,57 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
     def handle_info(self):
         """Handle /info endpoint (service info)"""
         try:
-            uptime = None
-            cogs_count = 0
-
-            if bot_instance:
-                if hasattr(bot_instance, 'start_time'):
-                    uptime = (
-                        datetime.utcnow() - bot_instance.start_time
-                    ).total_seconds()
-                if hasattr(bot_instance, 'loaded_cogs'):
-                    cogs_count = len(bot_instance.loaded_cogs)
-
             info = {
                 "service": "Logiq Stoat Bot",
                 "version": "1.0.0",
-                "environment": os.getenv("ENVIRONMENT", "development"),
+                "environment": _env(),
                 "platform": "Stoat.chat",
-                "uptime_seconds": uptime,
-                "cogs_loaded": cogs_count,
-                "timestamp": datetime.utcnow().isoformat()
+                "uptime_seconds": probes.uptime(),
+                "cogs_loaded": probes.cogs_count(),
+                "timestamp": utc_now_iso()
             }
 
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(info, indent=2).encode())
+            self._send_json(200, info)
 
         except Exception as e:
             logger.error(f"Info check error: {e}")
             self.send_response(500)
             self.end_headers()
 
-    def _check_bot(self) -> dict:
-        """Check bot status"""
-        if bot_instance and hasattr(bot_instance, 'adapter'):
-            connected = bot_instance.adapter and bot_instance.adapter.is_connected()
-            return {
-                "status": "healthy" if connected else "unhealthy",
-                "connected": connected
-            }
-        return {"status": "unhealthy", "error": "Bot not initialized"}
-
-    def _check_database(self) -> dict:
-        """Check database connection"""
-        if bot_instance and hasattr(bot_instance, 'db'):
-            connected = bot_instance.db.is_connected
-            return {
-                "status": "healthy" if connected else "unhealthy",
-                "connected": connected
-            }
-        return {"status": "unhealthy", "error": "Database not initialized"}
-
-    def _check_adapter(self) -> dict:
-        """Check Stoat adapter"""
-        if bot_instance and hasattr(bot_instance, 'adapter'):
-            adapter_status = "healthy" if bot_instance.adapter else "unhealthy"
-            return {
-                "status": adapter_status,
-                "adapter": "Stoat"
-            }
-        return {"status": "unhealthy", "error": "No adapter"}
-
-    def _check_cogs(self) -> dict:
-        """Check cogs status"""
-        if bot_instance and hasattr(bot_instance, 'loaded_cogs'):
-            return {
-                "status": "healthy",
-                "cogs_loaded": len(bot_instance.loaded_cogs)
-            }
-        return {"status": "unknown", "cogs_loaded": 0}
+    def _send_json(self, status_code: int, payload: dict) -> None:
+        """Serialize payload once and write it with an explicit Content-Length"""
+        # No indent: lets json use its C encoder instead of the pure-Python one
+        body = _json_encoder.encode(payload).encode()
+        self.send_response(status_code)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def log_message(self, format, *args):
         """Suppress default logging"""
         pass
 
 
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """Threaded server that lets several worker processes share the probe port"""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        # SO_REUSEPORT is unavailable on Windows; fall back to a plain bind there
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
 def start_health_check(bot):
     """Start health check HTTP server"""
-    global bot_instance
-    bot_instance = bot
+    global probes
+    probes = _resolve_probes(bot)
 
     try:
-        server = HTTPServer(('0.0.0.0', 8080), HealthCheckHandler)
+        server = ReusePortHTTPServer(('0.0.0.0', 8080), HealthCheckHandler)
         logger.info("Health check server started on :8080")
         return server
     except Exception as e:
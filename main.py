@@ -7,6 +7,7 @@ import asyncio
 import logging
 import os
 import sys
+import time
 from pathlib import Path
 
 # Force UTF-8 on Windows CP1252 terminals so emoji in log messages don't crash
@@ -30,12 +31,24 @@ from typing import Optional
 load_dotenv()
 
 
+def _import_cog(name: str, reload: bool = False):
+    """Cog module from sys.modules, importing it first or reloading it if asked"""
+    mod_name = f'cogs.{name}'
+    module = sys.modules.get(mod_name)
+    if module is None:
+        return importlib.import_module(mod_name)
+    if reload:
+        return importlib.reload(module)
+    return module
+
+
 class Logiq:
     """Custom bot class (Stoat adapter only)"""
 
     def __init__(self, config: dict):
         self.config = config
         self.start_time = datetime.utcnow()
+        self.start_monotonic = time.monotonic()
         self.logger = BotLogger(config.get('logging', {}))
 
         self.db = None  # MongoDB removed; all persistence via Supabase
@@ -55,6 +68,16 @@ class Logiq:
 
         self.loaded_cogs = []
 
+        # Bumped whenever the bot joins or leaves a server; keys the /guilds cache
+        self.guilds_version = 0
+        if self.adapter:
+            self.adapter.on_event("ServerCreate")(self._on_guilds_changed)
+            self.adapter.on_event("ServerDelete")(self._on_guilds_changed)
+
+    async def _on_guilds_changed(self, event: dict) -> None:
+        """Invalidate cached guild listings"""
+        self.guilds_version += 1
+
     async def setup(self, token: str):
         """Setup bot and services"""
         # Start health check server
@@ -91,16 +114,23 @@ class Logiq:
 
         await self.load_cogs()
 
-    async def load_cogs(self):
-        """Dynamically import cogs and call their setup(adapter, db, config)"""
+    async def load_cogs(self, reload: bool = False):
+        """Dynamically import cogs and call their setup(adapter, db, config)
+
+        Already-imported cog modules are reused from sys.modules; pass
+        reload=True to re-execute them with importlib.reload instead.
+        """
         cogs_dir = Path(__file__).parent / 'cogs'
-        cog_files = [f.stem for f in cogs_dir.glob('*.py') if f.stem != '__init__']
+        cog_files = [sys.intern(f.stem) for f in cogs_dir.glob('*.py') if f.stem != '__init__']
 
         self.logger.info(f"📦 Loading {len(cog_files)} cogs...")
 
+        # Commands from every cog are registered with the adapter in one batch
+        all_commands = {}
+
         for cog in cog_files:
             try:
-                module = importlib.import_module(f'cogs.{cog}')
+                module = _import_cog(cog, reload)
                 setup = getattr(module, 'setup', None)
                 if callable(setup):
                     if inspect.iscoroutinefunction(setup):
@@ -110,8 +140,7 @@ class Logiq:
 
                     # Register cog commands and event listeners
                     if cog_instance:
-                        for cmd_name, cmd_handler in cog_instance._commands.items():
-                            self.adapter.add_command(cmd_name, cmd_handler)
+                        all_commands.update(cog_instance._commands)
                         for event_name, handlers in cog_instance._listeners.items():
                             if event_name not in self.adapter._event_handlers:
                                 self.adapter._event_handlers[event_name] = []
@@ -122,6 +151,7 @@ class Logiq:
             except Exception as e:
                 self.logger.error(f"  ❌ Failed to load {cog}: {e}", exc_info=True)
 
+        self.adapter.add_commands(all_commands)
         self.logger.info(f"✅ Loaded {len(self.loaded_cogs)}/{len(cog_files)} cogs")
 
     async def run_forever(self):
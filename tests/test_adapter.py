@@ -84,6 +84,18 @@ class TestStoatAdapter:
         assert "test" in adapter._commands
         assert adapter._commands["test"] == test_handler
 
+    def test_add_commands(self, adapter):
+        """Test batch command registration"""
+        async def ping_handler(payload):
+            return "pong"
+
+        async def help_handler(payload):
+            return "help"
+
+        adapter.add_commands({"Ping": ping_handler, "help": help_handler})
+        assert adapter._commands["ping"] == ping_handler
+        assert adapter._commands["help"] == help_handler
+
     def test_on_event_decorator(self, adapter):
         """Test event listener registration"""
         @adapter.on_event("test_event")
@@ -0,0 +1,275 @@
+"""
+Unit tests for the REST API
+Tests ETag handling, /guilds paging and caching, and /stats caching
+
+Requests go through httpx's ASGITransport, the in-process transport
+FastAPI's TestClient wraps.
+"""
+
+import hashlib
+
+import httpx
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from main import Logiq
+from web.api import create_app
+
+
+class FakeCursor:
+    """Minimal Motor cursor over in-memory guild documents"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def sort(self, key, direction):
+        self.calls.append(("sort", key, direction))
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self.calls.append(("skip", n))
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        self.calls.append(("limit", n))
+        self.docs = self.docs[:n]
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+@pytest.fixture
+def bot():
+    """Bot with a mocked database holding five guilds"""
+    bot = Mock()
+    bot.config = {}
+    bot.guilds_version = 0
+    bot.start_monotonic = None
+    guilds = [
+        {"guild_id": f"guild{i}", "name": f"Guild {i}", "member_count": i}
+        for i in (3, 1, 4, 0, 2)
+    ]
+    bot.db.db.guilds.find = Mock(side_effect=lambda *args: FakeCursor(list(guilds)))
+    bot.db.db.guilds.estimated_document_count = AsyncMock(return_value=5)
+    bot.db.db.users.estimated_document_count = AsyncMock(return_value=50)
+    return bot
+
+
+@pytest.fixture
+def app(bot):
+    return create_app(bot)
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+class TestETags:
+    """Test ETag tagging and conditional GETs"""
+
+    @pytest.mark.asyncio
+    async def test_matching_if_none_match_returns_304(self, client):
+        """Test a matching If-None-Match gets 304 with an empty body"""
+        first = await client.get("/stats")
+        etag = first.headers["etag"]
+
+        response = await client.get("/stats", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_non_matching_if_none_match_returns_200(self, client):
+        """Test a stale If-None-Match gets the full body and the current ETag"""
+        response = await client.get("/stats", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.json()["guilds"] == 5
+        expected = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        assert response.headers["etag"] == f'"{expected}"'
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path, etag", [("/", '"root-v1.0.0"'), ("/health", '"healthy-v1"')])
+    async def test_route_etags_skip_body_hashing(self, client, path, etag):
+        """Test routes that set their own ETag are not hashed"""
+        with patch("web.api.hashlib") as mock_hashlib:
+            response = await client.get(path)
+            not_modified = await client.get(path, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag
+        assert not_modified.status_code == 304
+        mock_hashlib.blake2b.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_get_responses_not_tagged(self, app, client):
+        """Test only GET responses are tagged"""
+        @app.post("/echo")
+        async def echo():
+            return {"ok": True}
+
+        response = await client.post("/echo")
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/missing", "/guilds?limit=0"])
+    async def test_error_responses_not_tagged(self, client, path):
+        """Test 4xx JSON responses are not tagged"""
+        response = await client.get(path)
+
+        assert response.status_code >= 400
+        assert "etag" not in response.headers
+
+
+class TestGuilds:
+    """Test /guilds paging and page cache"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query, status", [
+        ("limit=0", 422),
+        ("limit=101", 422),
+        ("skip=-1", 422),
+        ("limit=1", 200),
+        ("limit=100", 200),
+    ])
+    async def test_limit_bounds(self, client, query, status):
+        """Test skip and limit are validated"""
+        response = await client.get(f"/guilds?{query}")
+
+        assert response.status_code == status
+
+    @pytest.mark.asyncio
+    async def test_pages_sorted_by_guild_id(self, client, bot):
+        """Test pages walk the guilds in stable guild_id order"""
+        pages = [(await client.get(f"/guilds?skip={skip}&limit=2")).json() for skip in (0, 2, 4)]
+
+        ids = [g["guild_id"] for page in pages for g in page["guilds"]]
+        assert ids == [f"guild{i}" for i in range(5)]
+        assert [page["count"] for page in pages] == [2, 2, 1]
+        assert pages[1]["skip"] == 2 and pages[1]["limit"] == 2
+        bot.db.db.guilds.find.assert_called_with({}, {"guild_id": 1, "name": 1, "member_count": 1, "_id": 0})
+
+    @pytest.mark.asyncio
+    async def test_repeat_page_served_from_cache(self, client, bot):
+        """Test an identical page request doesn't query the database"""
+        first = await client.get("/guilds?skip=1&limit=2")
+        second = await client.get("/guilds?skip=1&limit=2")
+
+        assert second.content == first.content
+        bot.db.db.guilds.find.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_pages_expire(self, client, bot, monkeypatch):
+        """Test pages older than GUILDS_CACHE_TTL are fetched again"""
+        monkeypatch.setattr("web.api.GUILDS_CACHE_TTL", 0.0)
+
+        await client.get("/guilds")
+        await client.get("/guilds")
+
+        assert bot.db.db.guilds.find.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used_page(self, app, client, bot):
+        """Test the cache holds at most GUILDS_CACHE_PAGES pages"""
+        for skip in range(65):
+            await client.get(f"/guilds?skip={skip}")
+
+        pages = app.state.guilds_cache["pages"]
+        assert len(pages) == 64
+        assert (0, 20) not in pages
+
+        await client.get("/guilds?skip=1")
+        assert bot.db.db.guilds.find.call_count == 65
+        await client.get("/guilds?skip=0")
+        assert bot.db.db.guilds.find.call_count == 66
+
+    @pytest.mark.asyncio
+    async def test_guilds_version_change_clears_cache(self, client, bot):
+        """Test joining or leaving a server drops every cached page"""
+        await client.get("/guilds")
+        bot.guilds_version += 1
+        await client.get("/guilds")
+
+        assert bot.db.db.guilds.find.call_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("event_type", ["ServerCreate", "ServerDelete"])
+    async def test_server_events_clear_cache(self, bot, event_type):
+        """Test the adapter's join/leave events make the next /guilds hit the database"""
+        logiq = Logiq({})
+        logiq.db = bot.db
+        app = create_app(logiq)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            await client.get("/guilds")
+            await client.get("/guilds")
+            assert bot.db.db.guilds.find.call_count == 1
+
+            for handler in logiq.adapter._event_handlers[event_type]:
+                await handler({"type": event_type, "id": "guild9"})
+            await client.get("/guilds")
+
+        assert bot.db.db.guilds.find.call_count == 2
+
+
+class TestStats:
+    """Test /stats count caching"""
+
+    @pytest.mark.asyncio
+    async def test_counts_cached_within_ttl(self, client, bot, monkeypatch):
+        """Test counts are fetched once per STATS_CACHE_TTL window"""
+        now = [1000.0]
+        monkeypatch.setattr("web.api.time", Mock(monotonic=lambda: now[0]))
+        count = bot.db.db.guilds.estimated_document_count
+
+        await client.get("/stats")
+        now[0] += 9.0
+        response = await client.get("/stats")
+        assert count.await_count == 1
+        assert response.json()["guilds"] == 5
+
+        count.return_value = 6
+        now[0] += 1.0
+        response = await client.get("/stats")
+        assert count.await_count == 2
+        assert bot.db.db.users.estimated_document_count.await_count == 2
+        assert response.json()["guilds"] == 6
+
+    @pytest.mark.asyncio
+    async def test_cache_per_app(self, client, bot):
+        """Test separate app instances don't share cached counts"""
+        await client.get("/stats")
+
+        other = Mock()
+        other.config = {}
+        other.start_monotonic = None
+        other.db.db.guilds.estimated_document_count = AsyncMock(return_value=7)
+        other.db.db.users.estimated_document_count = AsyncMock(return_value=70)
+        transport = httpx.ASGITransport(app=create_app(other))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as other_client:
+            response = await other_client.get("/stats")
+
+        assert response.json()["guilds"] == 7
+        other.db.db.guilds.estimated_document_count.assert_awaited_once()
+        bot.db.db.guilds.estimated_document_count.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,104 @@
+"""
+Unit tests for mention and ID converters
+Checks the string-scanning parsers against the regexes they replaced
+"""
+
+import re
+
+import pytest
+
+from utils.converters import ChannelConverter, RoleConverter, UserConverter
+
+ULID = "01ARZ3NDEKTSV4RRFFQ69G5FAV"
+
+# The original regex implementations, kept as the reference behaviour
+_ROLE_RE = re.compile(r'<@&(\d+)>')
+_CHANNEL_RE = re.compile(r'<#(\d+)>')
+_ULID_RE = re.compile(r'^[0-9A-HJKMNP-TV-Z]{26}$')
+_MENTION_RE = re.compile(r'<@!?([0-9A-HJKMNP-TV-Z]{26}|\d+)>')
+
+
+def _regex_role(mention):
+    match = _ROLE_RE.match(mention)
+    return match.group(1) if match else None
+
+
+def _regex_channel(mention):
+    match = _CHANNEL_RE.match(mention)
+    return match.group(1) if match else None
+
+
+def _regex_user(value):
+    if not value:
+        return None
+    match = _MENTION_RE.match(value.strip())
+    if match:
+        return match.group(1)
+    if _ULID_RE.match(value.strip()):
+        return value.strip()
+    return None
+
+
+CASES = [
+    pytest.param("<@&123>", id="role-mention"),
+    pytest.param("<#456>", id="channel-mention"),
+    pytest.param("<@789>", id="user-numeric"),
+    pytest.param("<@!789>", id="user-legacy-bang"),
+    pytest.param(f"<@{ULID}>", id="user-ulid"),
+    pytest.param(f"<@!{ULID}>", id="user-bang-ulid"),
+    pytest.param(ULID, id="bare-ulid"),
+    pytest.param(f"  {ULID}  ", id="bare-ulid-padded"),
+    pytest.param(ULID[:-1], id="ulid-too-short"),
+    pytest.param(ULID + "A", id="ulid-too-long"),
+    pytest.param(f"<@{ULID[:-1]}>", id="mention-ulid-too-short"),
+    pytest.param("01ARZ3NDEKTSV4RRFFQ69G5FAI", id="crockford-I"),
+    pytest.param("01ARZ3NDEKTSV4RRFFQ69G5FAL", id="crockford-L"),
+    pytest.param("01ARZ3NDEKTSV4RRFFQ69G5FAO", id="crockford-O"),
+    pytest.param("01ARZ3NDEKTSV4RRFFQ69G5FAU", id="crockford-U"),
+    pytest.param(f"<@{ULID[:-1]}U>", id="mention-crockford-U"),
+    pytest.param(ULID.lower(), id="lowercase-ulid"),
+    pytest.param(f"<@{ULID.lower()}>", id="lowercase-mention"),
+    pytest.param("", id="empty"),
+    pytest.param("<@>", id="empty-user-mention"),
+    pytest.param("<@&>", id="empty-role-mention"),
+    pytest.param("<#>", id="empty-channel-mention"),
+    pytest.param("<@!>", id="bare-bang"),
+    pytest.param("<@&abc>", id="role-non-numeric"),
+    pytest.param("<#12a>", id="channel-non-numeric"),
+    pytest.param("<@&123", id="unterminated"),
+    pytest.param("<@&123>trailing", id="trailing-text"),
+    pytest.param("x<@&123>", id="leading-text"),
+    pytest.param("<@&12>3>", id="two-closers"),
+]
+
+
+@pytest.mark.parametrize("value", CASES)
+def test_role_matches_regex(value):
+    """Test parse_role_id agrees with <@&(\\d+)>"""
+    assert RoleConverter.parse_role_id(value) == _regex_role(value)
+
+
+@pytest.mark.parametrize("value", CASES)
+def test_channel_matches_regex(value):
+    """Test parse_channel_id agrees with <#(\\d+)>"""
+    assert ChannelConverter.parse_channel_id(value) == _regex_channel(value)
+
+
+@pytest.mark.parametrize("value", CASES)
+def test_user_matches_regex(value):
+    """Test parse_user_id agrees with the mention and ULID regexes"""
+    assert UserConverter.parse_user_id(value) == _regex_user(value)
+
+
+def test_expected_ids():
+    """Test the IDs extracted from well-formed input"""
+    assert RoleConverter.parse_role_id("<@&123>") == "123"
+    assert ChannelConverter.parse_channel_id("<#456>") == "456"
+    assert UserConverter.parse_user_id("<@!789>") == "789"
+    assert UserConverter.parse_user_id(f"<@{ULID}>") == ULID
+    assert UserConverter.parse_user_id(ULID) == ULID
+    assert UserConverter.parse_user_id(None) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -3,27 +3,39 @@ Unit tests for database manager
 Tests Stoat schema operations
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 
-from database.db_manager import DatabaseManager
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from database.db_manager import LEADERBOARD_SNAPSHOT_SIZE, DatabaseManager, XPFirehose
 
 
 class TestDatabaseManager:
     """Test database manager"""
 
-    @pytest.fixture
-    async def db(self):
-        """Create database instance (mock MongoDB)"""
-        with patch('motor.motor_asyncio.AsyncMotorClient'):
-            db = DatabaseManager(
+    @pytest.fixture(scope="class")
+    def db_manager(self):
+        """Create database instance and mocked MongoDB once per class"""
+        with patch('database.db_manager.AsyncIOMotorClient'):
+            manager = DatabaseManager(
                 "mongodb://localhost:27017",
                 "test_db",
                 pool_size=5
             )
-            db.db = AsyncMock()
-            return db
+        manager.db = AsyncMock()
+        return manager
+
+    @pytest.fixture
+    def db(self, db_manager):
+        """Shared instance, reset after each test"""
+        yield db_manager
+        db_manager.db.reset_mock(return_value=True, side_effect=True)
+        db_manager._leaderboard_guilds.clear()
+        db_manager._xp_firehose = None
 
     @pytest.mark.asyncio
     async def test_db_initialization(self, db):
@@ -31,6 +43,35 @@ class TestDatabaseManager:
         assert db.database_name == "test_db"
         assert db.pool_size == 5
 
+    @pytest.mark.asyncio
+    async def test_connect_pool_options(self):
+        """Test connect pre-warms and bounds the connection pool"""
+        with patch('database.db_manager.AsyncIOMotorClient') as client_cls:
+            client_cls.return_value.admin.command = AsyncMock()
+            db = DatabaseManager("mongodb://localhost:27017", "test_db", pool_size=20)
+            db._create_indexes = AsyncMock()
+
+            await db.connect()
+            db._leaderboard_task.cancel()
+
+        options = client_cls.call_args.kwargs
+        assert options["minPoolSize"] == 5
+        assert options["maxPoolSize"] == 20
+        assert options["maxIdleTimeMS"] == 60000
+
+    @pytest.mark.asyncio
+    async def test_indexes_created(self, db):
+        """Test point-lookup and log queries are backed by compound indexes"""
+        await db._create_indexes()
+
+        db.db.users.create_index.assert_any_call([("user_id", 1), ("guild_id", 1)], unique=True)
+        db.db.guilds.create_index.assert_any_call([("guild_id", 1)], unique=True)
+        db.db.members.create_index.assert_any_call([("guild_id", 1), ("user_id", 1)], unique=True)
+        db.db.members.create_index.assert_any_call([("guild_id", 1), ("roles", 1)])
+        db.db.moderation_actions.create_index.assert_any_call(
+            [("guild_id", 1), ("target_id", 1), ("timestamp", -1)]
+        )
+
     @pytest.mark.asyncio
     async def test_get_user(self, db):
         """Test get_user query"""
@@ -104,27 +145,123 @@ class TestDatabaseManager:
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_remove_balance_sufficient_funds(self, db):
+    async def test_add_xp_batches_writes(self, db):
+        """Test add_xp coalesces increments into one bulk_write"""
+        db.db.users = AsyncMock()
+        db.db.users.bulk_write = AsyncMock()
+
+        for _ in range(3):
+            assert await db.add_xp("user123", "guild456", 10) is True
+        await db.add_xp("user789", "guild456", 5)
+        db.db.users.bulk_write.assert_not_called()
+
+        await db.flush_writes()
+
+        db.db.users.bulk_write.assert_called_once()
+        ops = db.db.users.bulk_write.call_args[0][0]
+        assert ops == [
+            UpdateOne({"user_id": "user123", "guild_id": "guild456"}, {"$inc": {"xp": 30}}),
+            UpdateOne({"user_id": "user789", "guild_id": "guild456"}, {"$inc": {"xp": 5}}),
+        ]
+        assert db.db.users.bulk_write.call_args.kwargs == {"ordered": False}
+
+    @pytest.mark.asyncio
+    async def test_xp_flush_failure_requeues_increments(self):
+        """Test increments from a transiently failed flush are retried by the next one"""
+        collection = AsyncMock()
+        collection.bulk_write = AsyncMock(side_effect=[AutoReconnect("connection reset"), None])
+        firehose = XPFirehose(collection)
+
+        firehose.add("user123", "guild456", "xp", 10)
+        await firehose.flush()
+        firehose.add("user123", "guild456", "xp", 5)
+        await firehose.flush()
+
+        ops = collection.bulk_write.call_args[0][0]
+        assert ops == [UpdateOne({"user_id": "user123", "guild_id": "guild456"}, {"$inc": {"xp": 15}})]
+
+    @pytest.mark.asyncio
+    async def test_xp_flush_drops_write_errors(self):
+        """Test increments rejected per document are dropped, not retried forever"""
+        error = BulkWriteError({"writeErrors": [{"index": 0, "code": 14, "errmsg": "Cannot apply $inc"}]})
+        collection = AsyncMock()
+        collection.bulk_write = AsyncMock(side_effect=[error, None])
+        firehose = XPFirehose(collection)
+
+        firehose.add("user123", "guild456", "xp", 10)
+        firehose.add("user789", "guild456", "xp", 5)
+        await firehose.flush()
+
+        assert not firehose._pending
+        await firehose.flush()
+        collection.bulk_write.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_xp_flush_retries_are_capped(self):
+        """Test a document that keeps failing is dropped after max_retries"""
+        collection = AsyncMock()
+        collection.bulk_write = AsyncMock(side_effect=AutoReconnect("connection reset"))
+        firehose = XPFirehose(collection, max_retries=2)
+
+        firehose.add("user123", "guild456", "xp", 10)
+        for _ in range(3):
+            await firehose.flush()
+
+        assert collection.bulk_write.await_count == 3
+        assert not firehose._pending
+        assert not firehose._attempts
+
+    @pytest.mark.asyncio
+    async def test_xp_firehose_single_flush_in_flight(self):
+        """Test a full queue starts one flush, and drain waits for it"""
+        release = asyncio.Event()
+        written = []
+
+        async def bulk_write(ops, ordered):
+            await release.wait()
+            written.extend(ops)
+
+        collection = Mock()
+        collection.bulk_write = bulk_write
+        firehose = XPFirehose(collection, max_pending=2)
+
+        for i in range(6):
+            firehose.add(f"user{i}", "guild456", "xp", 1)
+        await asyncio.sleep(0)
+        running = firehose._flush_task
+
+        assert running is not None and not running.done()
+        firehose.add("user9", "guild456", "xp", 1)
+        assert firehose._flush_task is running
+
+        release.set()
+        await firehose.drain()
+
+        assert len(written) == 7
+        assert not firehose._pending
+
+    @pytest.mark.asyncio
+    async def test_remove_balance_sufficient_funds(self, db, monkeypatch):
         """Test remove_balance with sufficient funds"""
         db.db.users = AsyncMock()
 
         # Mock get_user returns user with balance
         mock_user = {"balance": 500}
-        db.get_user = AsyncMock(return_value=mock_user)
+        monkeypatch.setattr(db, "get_user", AsyncMock(return_value=mock_user))
 
         # Mock increment_user_field
-        db.increment_user_field = AsyncMock(return_value=True)
+        monkeypatch.setattr(db, "increment_user_field", AsyncMock(return_value=True), raising=False)
 
         result = await db.remove_balance("user123", "guild456", 100)
 
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_remove_balance_insufficient_funds(self, db):
+    async def test_remove_balance_insufficient_funds(self, db, monkeypatch):
         """Test remove_balance with insufficient funds"""
         db.db.users = AsyncMock()
         mock_user = {"balance": 50}
-        db.get_user = AsyncMock(return_value=mock_user)
+        monkeypatch.setattr(db, "get_user", AsyncMock(return_value=mock_user))
 
         result = await db.remove_balance("user123", "guild456", 100)
 
@@ -163,25 +300,114 @@ class TestDatabaseManager:
 
     @pytest.mark.asyncio
     async def test_get_leaderboard(self, db):
-        """Test get_leaderboard returns top users"""
+        """Test get_leaderboard reads the guild's snapshot"""
+        mock_users = [
+            {"user_id": "user1", "balance": 1000},
+            {"user_id": "user2", "balance": 800},
+            {"user_id": "user3", "balance": 600}
+        ]
+
+        db.db.leaderboard_snapshots.find_one = AsyncMock(return_value={"entries": mock_users})
+        db.db.users = AsyncMock()
+        db.db.users.find = Mock()
+
+        leaderboard = await db.get_leaderboard("guild123", limit=3)
+
+        assert leaderboard == mock_users
+        db.db.leaderboard_snapshots.find_one.assert_called_once_with(
+            {"guild_id": "guild123"},
+            {"entries": {"$slice": 3}, "_id": 0}
+        )
+        db.db.users.find.assert_not_called()
+        assert "guild123" in db._leaderboard_guilds
+
+    @pytest.mark.asyncio
+    async def test_get_leaderboard_without_snapshot(self, db):
+        """Test get_leaderboard falls back to a live query and schedules a refresh"""
         mock_users = [
-            {"user_id": "user1", "xp": 1000},
-            {"user_id": "user2", "xp": 800},
-            {"user_id": "user3", "xp": 600}
+            {"user_id": "user1", "balance": 1000},
+            {"user_id": "user2", "balance": 800},
+            {"user_id": "user3", "balance": 600}
         ]
 
         mock_cursor = AsyncMock()
         mock_cursor.to_list = AsyncMock(return_value=mock_users)
 
+        db.db.leaderboard_snapshots.find_one = AsyncMock(return_value=None)
         db.db.users = AsyncMock()
         db.db.users.find = Mock(return_value=mock_cursor)
+        db.db.users.aggregate = Mock(return_value=mock_cursor)
         mock_cursor.sort = Mock(return_value=mock_cursor)
         mock_cursor.limit = Mock(return_value=mock_cursor)
 
-        leaderboard = await db.get_leaderboard("guild123", limit=3)
+        with patch.object(db, "refresh_leaderboard", AsyncMock()) as refresh:
+            leaderboard = await db.get_leaderboard("guild123", limit=3)
+            # One step runs the refresh, the next its done callback
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
 
         assert len(leaderboard) == 3
-        assert leaderboard[0]["xp"] == 1000
+        assert leaderboard[0]["balance"] == 1000
+        db.db.users.find.assert_called_once_with(
+            {"guild_id": "guild123"},
+            {"user_id": 1, "balance": 1, "_id": 0}
+        )
+        mock_cursor.sort.assert_called_once_with("balance", -1)
+        refresh.assert_awaited_once_with("guild123")
+        assert not db._background_tasks
+
+        # Filter, sort and projection must all be served by one index
+        await db._create_indexes()
+        db.db.users.create_index.assert_any_call([("guild_id", 1), ("balance", -1), ("user_id", 1)])
+
+    @pytest.mark.asyncio
+    async def test_get_leaderboard_beyond_snapshot_size(self, db):
+        """Test limits the snapshot can't serve skip the snapshot read"""
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mock_cursor.sort = Mock(return_value=mock_cursor)
+        mock_cursor.limit = Mock(return_value=mock_cursor)
+        db.db.users.find = Mock(return_value=mock_cursor)
+        db._leaderboard_guilds.add("guild123")
+
+        await db.get_leaderboard("guild123", limit=LEADERBOARD_SNAPSHOT_SIZE + 1)
+
+        db.db.leaderboard_snapshots.find_one.assert_not_called()
+        mock_cursor.limit.assert_called_once_with(LEADERBOARD_SNAPSHOT_SIZE + 1)
+
+    @pytest.mark.asyncio
+    async def test_refresh_leaderboard(self, db):
+        """Test refresh_leaderboard merges the top users into the snapshot collection"""
+        mock_cursor = AsyncMock()
+        db.db.users = AsyncMock()
+        db.db.users.aggregate = Mock(return_value=mock_cursor)
+
+        await db.refresh_leaderboard("guild123")
+
+        pipeline = db.db.users.aggregate.call_args.args[0]
+        assert pipeline[0] == {"$match": {"guild_id": "guild123"}}
+        assert pipeline[1] == {"$sort": {"balance": -1}}
+        assert pipeline[-1]["$merge"]["into"] == "leaderboard_snapshots"
+        mock_cursor.to_list.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_members(self, db):
+        """Test get_members fetches several members in one query"""
+        mock_members = [{"user_id": "user1"}, {"user_id": "user2"}]
+
+        mock_cursor = AsyncMock()
+        mock_cursor.to_list = AsyncMock(return_value=mock_members)
+
+        db.db.members = AsyncMock()
+        db.db.members.find = Mock(return_value=mock_cursor)
+
+        members = await db.get_members("guild123", ["user1", "user2"])
+
+        assert members == mock_members
+        db.db.members.find.assert_called_once_with({
+            "guild_id": "guild123",
+            "user_id": {"$in": ["user1", "user2"]}
+        })
 
     @pytest.mark.asyncio
     async def test_add_member_role(self, db):
@@ -208,6 +434,24 @@ class TestDatabaseManager:
 
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_create_member_invalidates_permission_cache(self, db):
+        """Test a member looked up before creation isn't served from the cache"""
+        with patch('database.db_manager.PermissionChecker.invalidate') as invalidate:
+            await db.create_member("guild123", "user456", {"is_admin": True})
+
+        db.db.members.insert_one.assert_awaited_once()
+        invalidate.assert_called_once_with("guild123", "user456")
+
+    @pytest.mark.asyncio
+    async def test_create_guild_invalidates_permission_cache(self, db):
+        """Test an owner looked up before the guild existed isn't served from the cache"""
+        with patch('database.db_manager.PermissionChecker.invalidate') as invalidate:
+            await db.create_guild("guild123", {"owner_id": "user456"})
+
+        db.db.guilds.insert_one.assert_awaited_once()
+        invalidate.assert_called_once_with("guild123")
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file
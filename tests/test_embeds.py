@@ -0,0 +1,49 @@
+"""
+Unit tests for embed builders
+Checks the dict-literal builders match what embed_create produced
+"""
+
+import pytest
+
+from utils.embeds import EmbedColor, EmbedFactory, embed_create
+
+
+@pytest.fixture(autouse=True)
+def fixed_timestamp(monkeypatch):
+    monkeypatch.setattr("utils.embeds.utc_now_iso", lambda: "2026-01-01T00:00:00")
+
+
+@pytest.mark.parametrize("builder, prefix, color", [
+    (EmbedFactory.success, "✅", EmbedColor.SUCCESS),
+    (EmbedFactory.error, "❌", EmbedColor.ERROR),
+    (EmbedFactory.warning, "⚠️", EmbedColor.WARNING),
+    (EmbedFactory.info, "ℹ️", EmbedColor.INFO),
+])
+@pytest.mark.parametrize("description", ["Details", "", None])
+def test_status_builders_match_create(builder, prefix, color, description):
+    """Test status embeds equal embed_create output, leaving out empty descriptions"""
+    embed = builder("Title", description)
+
+    assert embed == embed_create(title=f"{prefix} Title", description=description, color=color)
+    assert ("description" in embed) == bool(description)
+
+
+@pytest.mark.parametrize("message", ["Hello", ""])
+def test_ai_response_matches_create(message):
+    """Test the AI embed omits an empty message like embed_create"""
+    assert EmbedFactory.ai_response(message, "gpt") == embed_create(
+        title="🤖 AI Response", description=message, color=EmbedColor.AI, footer="Powered by gpt"
+    )
+
+
+def test_moderation_action_without_action_title():
+    """Test an empty action leaves the title out"""
+    embed = EmbedFactory.moderation_action("", "user1", "User", "mod1", "Mod", "Spam")
+
+    assert "title" not in embed
+    assert embed["description"].startswith("**User:** <@user1>")
+    assert embed["color"] == EmbedColor.WARNING
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,76 @@
+"""
+Unit tests for Stoat feature flags
+Tests per-instance overrides on top of the read-only defaults
+"""
+
+import pytest
+
+from utils import feature_flags
+from utils.feature_flags import DEFAULT_FLAGS, FeatureStatus, StoatFeatureFlags, is_feature_enabled
+
+
+@pytest.fixture(autouse=True)
+def fresh_global_flags(monkeypatch):
+    """Each test gets its own global flags and an empty is_feature_enabled cache"""
+    monkeypatch.setattr(feature_flags, "_global_flags", None)
+    is_feature_enabled.cache_clear()
+    yield
+    is_feature_enabled.cache_clear()
+
+
+class TestFeatureFlagOverrides:
+    """Test copy-on-write overrides"""
+
+    def test_set_status_leaves_defaults_and_other_instances(self):
+        """Test set_status only changes the instance it's called on"""
+        flags = StoatFeatureFlags()
+        other = StoatFeatureFlags()
+
+        flags.set_status("moderation", FeatureStatus.DISABLED)
+
+        assert flags.is_enabled("moderation") is False
+        assert other.is_enabled("moderation") is True
+        assert DEFAULT_FLAGS["moderation"]["status"] == FeatureStatus.ENABLED
+
+    def test_set_rollout_leaves_defaults_and_other_instances(self):
+        """Test set_rollout only changes the instance it's called on"""
+        flags = StoatFeatureFlags()
+        other = StoatFeatureFlags()
+
+        flags.set_rollout("economy", 100)
+
+        assert flags.is_enabled("economy", "server1") is True
+        assert flags.get_all_features()["economy"]["rollout"] == 100
+        assert other.get_all_features()["economy"]["rollout"] == 50
+        assert DEFAULT_FLAGS["economy"]["rollout"] == 50
+
+    def test_setters_clear_is_feature_enabled_cache(self):
+        """Test is_feature_enabled sees flag changes immediately"""
+        flags = feature_flags.get_feature_flags()
+        assert is_feature_enabled("economy", "server1") == flags.is_enabled("economy", "server1")
+
+        flags.set_rollout("economy", 0)
+        assert is_feature_enabled("economy", "server1") is False
+
+        flags.set_rollout("economy", 100)
+        assert is_feature_enabled("economy", "server1") is True
+
+        flags.set_status("economy", FeatureStatus.DISABLED)
+        assert is_feature_enabled("economy", "server1") is False
+
+    def test_get_all_features_returns_mutable_copies(self):
+        """Test callers can edit the returned flags without touching the manager"""
+        flags = StoatFeatureFlags()
+        flags.set_rollout("leveling", 75)
+
+        features = flags.get_all_features()
+        features["moderation"]["status"] = FeatureStatus.DISABLED
+        features["leveling"]["rollout"] = 0
+
+        assert flags.is_enabled("moderation") is True
+        assert flags.get_all_features()["leveling"]["rollout"] == 75
+        assert DEFAULT_FLAGS["moderation"]["status"] == FeatureStatus.ENABLED
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
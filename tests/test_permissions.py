@@ -3,8 +3,10 @@ Unit tests for Stoat permission checking (Stoat-only)
 Tests Stoat permission functionality
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock
+from utils import permissions
 from utils.permissions import (
     is_admin,
     is_mod,
@@ -14,85 +16,97 @@ from utils.permissions import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_permission_caches():
+    """Each test sets up its own members and guild owner"""
+    permissions._owner_cache.clear()
+    permissions._member_cache.clear()
+    yield
+    permissions._owner_cache.clear()
+    permissions._member_cache.clear()
+
+
 class TestStoatPermissionChecks:
     """Test Stoat permission checks"""
 
+    @pytest.fixture(scope="class")
+    def shared_db(self):
+        """One mock database for the whole class"""
+        return Mock()
+
+    @pytest.fixture
+    def mock_db(self, shared_db):
+        """Shared mock, reset after each test"""
+        yield shared_db
+        shared_db.reset_mock()
+
     @pytest.mark.asyncio
-    async def test_is_admin_true(self):
+    async def test_is_admin_true(self, mock_db):
         """Test admin check returns True"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value={"is_admin": True})
 
         result = await is_admin(mock_db, "guild1", "user1")
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_is_admin_false(self):
+    async def test_is_admin_false(self, mock_db):
         """Test admin check returns False"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value={"is_admin": False})
 
         result = await is_admin(mock_db, "guild1", "user1")
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_is_admin_no_member(self):
+    async def test_is_admin_no_member(self, mock_db):
         """Test admin check with no member"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value=None)
 
         result = await is_admin(mock_db, "guild1", "user1")
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_is_mod_true(self):
+    async def test_is_mod_true(self, mock_db):
         """Test mod check returns True"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value={"is_mod": True})
 
         result = await is_mod(mock_db, "guild1", "user1")
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_is_mod_admin_counts(self):
+    async def test_is_mod_admin_counts(self, mock_db):
         """Test that admin also counts as mod"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value={"is_admin": True, "is_mod": False})
 
         result = await is_mod(mock_db, "guild1", "user1")
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_has_role_true(self):
+    async def test_has_role_true(self, mock_db):
         """Test has_role returns True"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value={"roles": ["role1", "role2"]})
 
         result = await has_role(mock_db, "guild1", "user1", "role1")
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_has_role_false(self):
+    async def test_has_role_false(self, mock_db):
         """Test has_role returns False"""
-        mock_db = Mock()
         mock_db.get_member = AsyncMock(return_value={"roles": ["role1"]})
 
         result = await has_role(mock_db, "guild1", "user1", "role2")
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_is_guild_owner_true(self):
+    async def test_is_guild_owner_true(self, mock_db):
         """Test is_guild_owner returns True"""
-        mock_db = Mock()
         mock_db.get_guild = AsyncMock(return_value={"owner_id": "user1"})
 
         result = await is_guild_owner(mock_db, "guild1", "user1")
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_is_guild_owner_false(self):
+    async def test_is_guild_owner_false(self, mock_db):
         """Test is_guild_owner returns False"""
-        mock_db = Mock()
         mock_db.get_guild = AsyncMock(return_value={"owner_id": "user2"})
 
         result = await is_guild_owner(mock_db, "guild1", "user1")
@@ -113,6 +127,25 @@ class TestPermissionChecker:
         assert result is False
         assert "yourself" in msg.lower()
 
+    @pytest.mark.asyncio
+    async def test_can_moderate_owner_target(self):
+        """Test server owner can't be moderated"""
+        mock_db = Mock()
+        mock_db.get_member = AsyncMock(return_value={"is_mod": True})
+        mock_db.get_guild = AsyncMock(return_value={"owner_id": "owner1"})
+
+        result, msg = await PermissionChecker.can_moderate(
+            mock_db, "guild1", "mod1", "owner1"
+        )
+        assert result is False
+        assert "owner" in msg.lower()
+
+        result, msg = await PermissionChecker.can_moderate(
+            mock_db, "guild1", "mod1", "user1"
+        )
+        assert result is True
+        mock_db.get_guild.assert_called_once_with("guild1")
+
     @pytest.mark.asyncio
     async def test_get_permission_level_owner(self):
         """Test owner has level 3"""
@@ -153,6 +186,91 @@ class TestPermissionChecker:
         level = await PermissionChecker.get_permission_level(mock_db, "guild1", "user1")
         assert level == 0
 
+    @pytest.mark.asyncio
+    async def test_get_permission_level_caches_owner(self):
+        """Test guild owner is only fetched once within the TTL"""
+        mock_db = Mock()
+        mock_db.get_guild = AsyncMock(return_value={"owner_id": "user2"})
+        mock_db.get_member = AsyncMock(return_value={"is_mod": True})
+
+        assert await PermissionChecker.get_permission_level(mock_db, "guild1", "user1") == 1
+        assert await PermissionChecker.get_permission_level(mock_db, "guild1", "user2") == 3
+        mock_db.get_guild.assert_called_once_with("guild1")
+        mock_db.get_member.assert_called_once_with("guild1", "user1")
+
+    @pytest.mark.asyncio
+    async def test_get_permission_level_coalesces_concurrent_calls(self):
+        """Test concurrent identical checks share one member and guild query"""
+        mock_db = Mock()
+        mock_db.get_guild = AsyncMock(return_value={"owner_id": "user2"})
+        mock_db.get_member = AsyncMock(return_value={"is_admin": True})
+
+        levels = await asyncio.gather(*(
+            PermissionChecker.get_permission_level(mock_db, "guild1", "user1")
+            for _ in range(10)
+        ))
+
+        assert levels == [2] * 10
+        mock_db.get_guild.assert_called_once_with("guild1")
+        mock_db.get_member.assert_called_once_with("guild1", "user1")
+        assert not permissions._inflight
+
+    @pytest.mark.asyncio
+    async def test_member_cache_invalidate(self):
+        """Test member documents are cached until invalidated"""
+        mock_db = Mock()
+        mock_db.get_member = AsyncMock(return_value={"is_mod": True})
+
+        assert await is_mod(mock_db, "guild1", "user1") is True
+        assert await is_admin(mock_db, "guild1", "user1") is False
+        mock_db.get_member.assert_called_once_with("guild1", "user1")
+
+        PermissionChecker.invalidate("guild1", "user1")
+        mock_db.get_member.return_value = {"is_admin": True}
+
+        assert await is_admin(mock_db, "guild1", "user1") is True
+        assert mock_db.get_member.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_permission_levels_bulk(self):
+        """Test bulk levels fetch only uncached members, in one query"""
+        mock_db = Mock()
+        mock_db.get_guild = AsyncMock(return_value={"owner_id": "owner1"})
+        mock_db.get_member = AsyncMock(return_value={"is_admin": True})
+        mock_db.get_members = AsyncMock(return_value=[{"user_id": "mod1", "is_mod": True}])
+
+        assert await PermissionChecker.get_permission_level(mock_db, "guild1", "admin1") == 2
+
+        levels = await PermissionChecker.get_permission_levels_bulk(
+            mock_db, "guild1", ["owner1", "admin1", "mod1", "user1"]
+        )
+
+        assert levels == {"owner1": 3, "admin1": 2, "mod1": 1, "user1": 0}
+        mock_db.get_members.assert_called_once_with("guild1", ["owner1", "mod1", "user1"])
+        mock_db.get_guild.assert_called_once_with("guild1")
+
+    @pytest.mark.asyncio
+    async def test_get_permission_levels_bulk_respects_cache_size(self, monkeypatch):
+        """Test bulk lookups evict the oldest cached members like single lookups"""
+        monkeypatch.setattr(permissions, "MEMBER_CACHE_SIZE", 2)
+        mock_db = Mock()
+        mock_db.get_guild = AsyncMock(return_value={"owner_id": "owner1"})
+        mock_db.get_members = AsyncMock(return_value=[])
+
+        await PermissionChecker.get_permission_levels_bulk(mock_db, "guild1", ["user1", "user2", "user3"])
+
+        assert list(permissions._member_cache) == [("guild1", "user2"), ("guild1", "user3")]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("permission", [None, 42])
+    async def test_has_permission_rejects_non_string(self, permission):
+        """Test a missing or non-string permission is denied rather than raising"""
+        mock_db = Mock()
+        mock_db.get_guild = AsyncMock(return_value={"owner_id": "user1"})
+
+        assert await PermissionChecker.has_permission(mock_db, "guild1", "user1", permission) is False
+        mock_db.get_guild.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_check_hierarchy(self):
         """Test role hierarchy check"""
@@ -160,13 +278,19 @@ class TestPermissionChecker:
         mock_db.get_guild = AsyncMock(return_value={"owner_id": "user2"})
 
         # Admin checking regular user
-        mock_db.get_member = AsyncMock(side_effect=[
-            {"is_admin": True},  # executor
-            {}                    # target
+        mock_db.get_members = AsyncMock(return_value=[
+            {"user_id": "admin1", "is_admin": True},  # executor
+            {"user_id": "user1"}                      # target
         ])
 
         result = await PermissionChecker.check_hierarchy(mock_db, "guild1", "admin1", "user1")
         assert result is True
+        mock_db.get_members.assert_called_once_with("guild1", ["admin1", "user1"])
+
+        # Levels come from the shared member and owner caches on repeat checks
+        assert await PermissionChecker.check_hierarchy(mock_db, "guild1", "user1", "admin1") is False
+        mock_db.get_members.assert_called_once()
+        mock_db.get_guild.assert_called_once_with("guild1")
 
 
 if __name__ == '__main__':
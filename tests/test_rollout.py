@@ -0,0 +1,136 @@
+"""
+Unit tests for the Stoat rollout manager
+Tests rollout bucketing and cached rollout decisions
+"""
+
+import pytest
+
+from utils import rollout
+from utils.rollout import RolloutPhase, StoatRolloutManager, rollout_bucket, rollout_buckets
+
+FEATURES = ["economy", "leveling", "tickets", "giveaways", "ai_chat"]
+
+
+class TestRolloutBuckets:
+    """Test blake2b rollout bucketing"""
+
+    def test_buckets_are_stable(self):
+        """Test buckets match recorded values, so they survive restarts and hash seeds"""
+        assert [rollout_bucket(f"server{i}", "economy") for i in range(8)] == [91, 8, 25, 88, 45, 42, 80, 9]
+        assert rollout_bucket("01HZX3K5Q8R9T2V4W6Y8Z0A1B2", "tickets") == 33
+
+    def test_buckets_in_range(self):
+        """Test every bucket is in 0-99 and the range is actually used"""
+        buckets = {rollout_bucket(f"server{i}", feature) for i in range(2000) for feature in FEATURES}
+
+        assert min(buckets) == 0
+        assert max(buckets) == 99
+
+    @pytest.mark.parametrize("server_id", ["server1", "01HZX3K5Q8R9T2V4W6Y8Z0A1B2", ""])
+    def test_bulk_matches_single(self, server_id):
+        """Test rollout_buckets agrees with one rollout_bucket call per feature"""
+        assert rollout_buckets(server_id, FEATURES) == {
+            feature: rollout_bucket(server_id, feature) for feature in FEATURES
+        }
+
+
+class TestDecisionCache:
+    """Test cached rollout decisions stay bounded and in step with the config"""
+
+    @pytest.fixture
+    def manager(self):
+        return StoatRolloutManager()
+
+    @pytest.mark.asyncio
+    async def test_cache_bounded(self, manager, monkeypatch):
+        """Test the oldest decisions are evicted at DECISION_CACHE_SIZE"""
+        monkeypatch.setattr(rollout, "DECISION_CACHE_SIZE", 3)
+
+        for i in range(5):
+            await manager.can_use_feature("economy", f"server{i}")
+
+        assert list(manager._decision_cache) == [
+            ("economy", "server2"), ("economy", "server3"), ("economy", "server4")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_phase_change_invalidates_feature(self, manager):
+        """Test a phase change drops that feature's decisions only"""
+        manager.add_whitelist("tickets", "server1")
+        assert await manager.can_use_feature("tickets", "server1") is True
+        await manager.can_use_feature("economy", "server1")
+
+        manager.set_phase("tickets", RolloutPhase.GRADUAL)
+        manager.set_rollout_percentage("tickets", 0)
+
+        assert ("tickets", "server1") not in manager._decision_cache
+        assert ("economy", "server1") in manager._decision_cache
+        assert await manager.can_use_feature("tickets", "server1") is False
+
+        manager.set_phase("tickets", RolloutPhase.DEPRECATED)
+        assert "tickets" in manager._always_off
+
+    @pytest.mark.asyncio
+    async def test_failed_import_resets_caches(self, manager):
+        """Test a partially applied import still resyncs phase sets and caches"""
+        await manager.can_use_feature("economy", "server1")
+        manager.export_config()
+
+        # economy is applied before the bad phase value raises
+        manager.import_config('{"phases": {"economy": "stable", "tickets": "bogus"}}')
+
+        assert manager._phase_config["economy"] == RolloutPhase.STABLE
+        assert "economy" in manager._always_on
+        assert manager._decision_cache == {}
+        assert manager._export_cache is None
+        assert await manager.can_use_feature("economy", "server1") is True
+
+
+def _configure(manager):
+    """Mix of phases, lists and percentages covering every decision path"""
+    manager.set_phase("giveaways", RolloutPhase.DEPRECATED)
+    manager.add_whitelist("tickets", "server1")
+    manager.add_whitelist("tickets", "server2")
+    manager.add_blacklist("tickets", "server2")
+    manager.add_blacklist("economy", "server3")
+    manager.add_blacklist("moderation", "server4")
+    return manager
+
+
+class TestBulkChecks:
+    """Test bulk checks agree with can_use_feature"""
+
+    ALL_FEATURES = [
+        "core_features", "moderation", "economy", "leveling", "tickets",
+        "giveaways", "social_alerts", "ai_chat", "unknown_feature",
+    ]
+    SERVERS = [f"server{i}" for i in range(40)]
+
+    @pytest.mark.asyncio
+    async def test_features_bulk_matches_single(self):
+        """Test can_use_features_bulk, including always-on/off phases"""
+        single = _configure(StoatRolloutManager())
+        bulk = _configure(StoatRolloutManager())
+
+        for server_id in self.SERVERS:
+            expected = {f: await single.can_use_feature(f, server_id) for f in self.ALL_FEATURES}
+            assert await bulk.can_use_features_bulk(self.ALL_FEATURES, server_id) == expected
+            # Second pass is served from the decision cache
+            assert await bulk.can_use_features_bulk(self.ALL_FEATURES, server_id) == expected
+
+        assert not any(f in bulk._always_on | bulk._always_off for f, _ in bulk._decision_cache)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ALL_FEATURES)
+    async def test_bulk_servers_matches_single(self, feature):
+        """Test can_use_feature_bulk_servers for every phase"""
+        single = _configure(StoatRolloutManager())
+        bulk = _configure(StoatRolloutManager())
+
+        expected = [sid for sid in self.SERVERS if await single.can_use_feature(feature, sid)]
+
+        assert await bulk.can_use_feature_bulk_servers(feature, self.SERVERS) == expected
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
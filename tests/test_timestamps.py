@@ -0,0 +1,34 @@
+"""
+Unit tests for timestamp helpers
+Pins the naive ISO format shared by embeds, payloads and health checks
+"""
+
+import re
+from datetime import datetime
+
+import pytest
+
+from utils.embeds import embed_create
+from utils.stoat_converters import SchemaHelpers
+from utils.timestamps import utc_now_iso
+
+# Same shape as datetime.utcnow().isoformat() at one-second resolution
+NAIVE_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$")
+
+
+def test_utc_now_iso_is_naive_utc():
+    """Test the timestamp has no offset and is current UTC time"""
+    stamp = utc_now_iso()
+
+    assert NAIVE_ISO.match(stamp)
+    assert abs((datetime.utcnow() - datetime.fromisoformat(stamp)).total_seconds()) < 2
+
+
+@pytest.mark.parametrize("stamp", [
+    pytest.param(lambda: embed_create(title="t")["timestamp"], id="embed"),
+    pytest.param(lambda: SchemaHelpers.normalize_user_data({"user_id": "u"})["created_at"], id="created_at"),
+    pytest.param(lambda: SchemaHelpers.timestamp_to_iso(object()), id="timestamp_to_iso_fallback"),
+])
+def test_callers_use_naive_format(stamp):
+    """Test every caller of utc_now_iso produces the naive format"""
+    assert NAIVE_ISO.match(stamp())
@@ -2,7 +2,38 @@
 Constants and configuration values for Logiq (Stoat-only)
 """
 
-from typing import Dict, Any
+from functools import lru_cache
+from itertools import cycle
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Dict, Mapping
+
+__all__ = [
+    'BOT_NAME',
+    'BOT_VERSION',
+    'BOT_DESCRIPTION',
+    'BOT_PLATFORM',
+    'BOT_GITHUB',
+    'BOT_DOCS',
+    'EMOJIS',
+    'EMOJI',
+    'LEVELING',
+    'calculate_level_xp',
+    'ECONOMY',
+    'MODERATION',
+    'TIME_LIMITS',
+    'PAGINATION',
+    'AI_SETTINGS',
+    'MUSIC',
+    'TICKETS',
+    'GAMES',
+    'RATE_LIMITS',
+    'EMBED_LIMITS',
+    'PATHS',
+    'API_ENDPOINTS',
+    'STATUS_MESSAGES',
+    'next_status',
+    'STOAT_CONSTANTS',
+]
 
 # Bot Information (Stoat-only)
 BOT_NAME = "StoatMod"
@@ -18,7 +49,7 @@ BOT_GITHUB = "https://github.com/yourusername/Logiq"
 BOT_DOCS = "https://stoatmod.vercel.app"
 
 # Emoji Constants
-EMOJIS = {
+EMOJIS = MappingProxyType({
     "success": "✅",
     "error": "❌",
     "warning": "⚠️",
@@ -35,22 +66,30 @@ EMOJIS = {
     "ban": "🔨",
     "mute": "🔇",
     "kick": "👢"
-}
+})
+
+# Attribute-style access for new code: EMOJI.success instead of EMOJIS["success"]
+EMOJI = SimpleNamespace(**EMOJIS)
 
 # Leveling Constants
-LEVELING = {
+LEVELING = MappingProxyType({
     "xp_per_message": 10,
     "xp_cooldown": 60,  # seconds
     "base_xp": 100,
     "xp_multiplier": 1.5
-}
+})
 
+# Hoisted so calculate_level_xp skips the mapping lookups
+_BASE_XP = LEVELING["base_xp"]
+_XP_MULT = LEVELING["xp_multiplier"]
+
+@lru_cache(maxsize=256)
 def calculate_level_xp(level: int) -> int:
     """Calculate XP required for level"""
-    return int(LEVELING["base_xp"] * (level ** LEVELING["xp_multiplier"]))
+    return int(_BASE_XP * (level ** _XP_MULT))
 
 # Economy Constants
-ECONOMY = {
+ECONOMY = MappingProxyType({
     "starting_balance": 1000,
     "daily_reward": 100,
     "daily_cooldown": 86400,  # 24 hours
@@ -58,10 +97,10 @@ ECONOMY = {
     "currency_symbol": "💎",
     "max_bet": 10000,
     "min_bet": 10
-}
+})
 
 # Moderation Constants
-MODERATION = {
+MODERATION = MappingProxyType({
     "max_warnings": 3,
     "auto_ban_warnings": 5,
     "mute_role_name": "Muted",
@@ -69,42 +108,42 @@ MODERATION = {
     "max_emojis": 10,
     "spam_threshold": 5,
     "spam_interval": 5
-}
+})
 
 # Time Limits
-TIME_LIMITS = {
+TIME_LIMITS = MappingProxyType({
     "mute_max": 2419200,      # 28 days
     "timeout_max": 2419200,   # 28 days
     "reminder_max": 31536000  # 1 year
-}
+})
 
 # Pagination
-PAGINATION = {
+PAGINATION = MappingProxyType({
     "items_per_page": 10,
     "leaderboard_size": 10,
     "timeout": 60
-}
+})
 
 # AI Settings
-AI_SETTINGS = {
+AI_SETTINGS = MappingProxyType({
     "max_tokens": 500,
     "temperature": 0.7,
     "max_history": 10,
     "toxicity_threshold": 0.7,
     "spam_threshold": 0.8
-}
+})
 
 # Music Settings (Text-based on Stoat)
-MUSIC = {
+MUSIC = MappingProxyType({
     "max_queue_size": 100,
     "default_volume": 50,
     "max_song_length": 600,
     "search_results": 5,
     "voice_support": False  # Coming in Stoat v1.1+
-}
+})
 
 # Ticket Settings
-TICKETS = {
+TICKETS = MappingProxyType({
     "max_open_tickets": 3,
     "categories": [
         "General Support",
@@ -113,10 +152,10 @@ TICKETS = {
         "Suggestion",
         "Other"
     ]
-}
+})
 
 # Game Settings
-GAMES = {
+GAMES = MappingProxyType({
     "trivia_time": 30,
     "trivia_categories": ["general", "programming", "science", "history"],
     "blackjack_starting_chips": 100,
@@ -126,10 +165,10 @@ GAMES = {
         "odd_even": 1,
         "high_low": 1
     }
-}
+})
 
 # Rate Limits
-RATE_LIMITS: Dict[str, Dict[str, Any]] = {
+RATE_LIMITS: Mapping[str, Dict[str, Any]] = MappingProxyType({
     "commands": {
         "rate": 5,
         "per": 60
@@ -138,10 +177,10 @@ RATE_LIMITS: Dict[str, Dict[str, Any]] = {
         "rate": 10,
         "per": 10
     }
-}
+})
 
 # Embed Limits
-EMBED_LIMITS = {
+EMBED_LIMITS = MappingProxyType({
     "title": 256,
     "description": 4096,
     "fields": 25,
@@ -149,39 +188,46 @@ EMBED_LIMITS = {
     "field_value": 1024,
     "footer": 2048,
     "author": 256
-}
+})
 
 # File Paths
-PATHS = {
+PATHS = MappingProxyType({
     "logs": "logs",
     "data": "data",
     "temp": "temp",
     "assets": "assets"
-}
+})
 
 # API Endpoints (Stoat + Optional Services)
-API_ENDPOINTS = {
+API_ENDPOINTS = MappingProxyType({
     "stoat": "https://stoat.chat/api",
     "stoat_ws": "wss://stoat.chat/socket",
     "openai": "https://api.openai.com/v1",
     "anthropic": "https://api.anthropic.com/v1"
-}
+})
 
 # Status Messages (for Bot Activity on Stoat)
-STATUS_MESSAGES = [
+STATUS_MESSAGES = (
     "🎮 Managing your community",
     "🤖 Powered by AI on Stoat",
     "💎 Type /help",
     "🌍 Serving Stoat servers",
-    "🛡️ Keeping servers safe"
-]
+    "🛡️ Keeping servers safe",
+)
+_status_cycle = cycle(STATUS_MESSAGES)
+
+
+def next_status() -> str:
+    """Return the next status message in rotation"""
+    return next(_status_cycle)
+
 
 # Stoat-specific constants
-STOAT_CONSTANTS = {
+STOAT_CONSTANTS = MappingProxyType({
     "api_base": "https://stoat.chat/api",
     "ws_url": "wss://stoat.chat/socket",
     "bot_invite": "https://stoat.chat/bot/01KHQGBV9WEQYRBKXWHHENES43",
     "developer_portal": "https://stoat.chat/developers",
     "community_url": "https://stoat.chat/community",
     "aup_url": "https://stoat.chat/legal/community-guidelines",
-}
+})
@@ -5,6 +5,33 @@ Type Converters - Stoat-only utilities
 import re
 from typing import Optional
 
+_TIME_RE = re.compile(r'(\d+)([smhd])')
+
+# Stoat ULIDs: 26 chars, Crockford base32 (digits + uppercase minus I, L, O, U)
+_ULID_CHARS = frozenset('0123456789ABCDEFGHJKMNPQRSTVWXYZ')
+
+_TIME_UNITS = {
+    's': 1,
+    'm': 60,
+    'h': 3600,
+    'd': 86400
+}
+
+
+def _mention_body(value: str, prefix: str) -> Optional[str]:
+    """Return the text between prefix and the first '>', or None if not a mention"""
+    if not value.startswith(prefix):
+        return None
+    start = len(prefix)
+    end = value.find('>', start)
+    if end <= start:
+        return None
+    return value[start:end]
+
+
+def _is_ulid(value: str) -> bool:
+    return len(value) == 26 and _ULID_CHARS.issuperset(value)
+
 
 class TimeConverter:
     """Convert time strings to seconds"""
@@ -21,21 +48,12 @@ class TimeConverter:
         duration = duration.lower().strip()
 
         # Match pattern: number + unit
-        match = re.match(r'(\d+)([smhd])', duration)
+        match = _TIME_RE.match(duration)
         if not match:
             return None
 
         amount, unit = match.groups()
-        amount = int(amount)
-
-        units = {
-            's': 1,
-            'm': 60,
-            'h': 3600,
-            'd': 86400
-        }
-
-        return amount * units.get(unit, 0)
+        return int(amount) * _TIME_UNITS.get(unit, 0)
 
 
 class RoleConverter:
@@ -44,8 +62,8 @@ class RoleConverter:
     @staticmethod
     def parse_role_id(mention: str) -> Optional[str]:
         """Extract role ID from <@&123> format"""
-        match = re.match(r'<@&(\d+)>', mention)
-        return match.group(1) if match else None
+        role_id = _mention_body(mention, '<@&')
+        return role_id if role_id and role_id.isdecimal() else None
 
 
 class ChannelConverter:
@@ -54,18 +72,13 @@ class ChannelConverter:
     @staticmethod
     def parse_channel_id(mention: str) -> Optional[str]:
         """Extract channel ID from <#123> format"""
-        match = re.match(r'<#(\d+)>', mention)
-        return match.group(1) if match else None
+        channel_id = _mention_body(mention, '<#')
+        return channel_id if channel_id and channel_id.isdecimal() else None
 
 
 class UserConverter:
     """Parse Stoat user mentions and ULIDs"""
 
-    # Stoat ULIDs: 26 chars, Crockford base32 (digits + most uppercase letters)
-    _ULID_RE = re.compile(r'^[0-9A-HJKMNP-TV-Z]{26}$')
-    # Mention format: <@ULID> or legacy <@!numeric>
-    _MENTION_RE = re.compile(r'<@!?([0-9A-HJKMNP-TV-Z]{26}|\d+)>')
-
     @staticmethod
     def parse_user_id(value: Optional[str]) -> Optional[str]:
         """
@@ -76,11 +89,14 @@ class UserConverter:
         """
         if not value:
             return None
-        # Try mention format first
-        match = UserConverter._MENTION_RE.match(value.strip())
-        if match:
-            return match.group(1)
+        value = value.strip()
+        # Try mention format first: <@ULID> or legacy <@!numeric>
+        user_id = _mention_body(value, '<@')
+        if user_id is not None:
+            if user_id.startswith('!'):
+                user_id = user_id[1:]
+            if _is_ulid(user_id) or user_id.isdecimal():
+                return user_id
+            return None
         # Try raw ULID
-        if UserConverter._ULID_RE.match(value.strip()):
-            return value.strip()
-        return None
+        return value if _is_ulid(value) else None
@@ -4,11 +4,19 @@ Creates consistent, themed embeds
 Returns dictionaries instead of discord.Embed objects
 """
 
+from enum import IntEnum
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 
+from utils.timestamps import utc_now_iso
 
-class EmbedColor:
+# Leaderboard prefixes for the top three places
+_MEDALS = ("🥇", "🥈", "🥉")
+
+# Rank card progress bars, indexed by filled tenths (0-10)
+_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
+
+class EmbedColor(IntEnum):
     """Color palette for embeds (Stoat-compatible)"""
     PRIMARY = 0x5865F2      # Blurple
     SUCCESS = 0x57F287      # Green
@@ -26,221 +34,250 @@ class EmbedColor:
     STOAT_PRIMARY = 0x2F3136  # Dark gray
 
 
+# Plain ints for the builders, so embed dicts never carry enum members
+_C_AI = int(EmbedColor.AI)
+_C_ECONOMY = int(EmbedColor.ECONOMY)
+_C_ERROR = int(EmbedColor.ERROR)
+_C_INFO = int(EmbedColor.INFO)
+_C_LEVELING = int(EmbedColor.LEVELING)
+_C_PRIMARY = int(EmbedColor.PRIMARY)
+_C_SUCCESS = int(EmbedColor.SUCCESS)
+_C_WARNING = int(EmbedColor.WARNING)
+
+
+def embed_create(
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+    color: int = _C_PRIMARY,
+    footer: Optional[str] = None,
+    thumbnail: Optional[str] = None,
+    image: Optional[str] = None,
+    fields: Optional[List[Dict[str, Any]]] = None,
+    timestamp: bool = True
+) -> Dict[str, Any]:
+    """
+    Create a custom embed dictionary
+
+    Args:
+        title: Embed title
+        description: Embed description
+        color: Embed color (hex)
+        footer: Footer text
+        thumbnail: Thumbnail URL
+        image: Image URL
+        fields: List of field dictionaries
+        timestamp: Whether to add timestamp
+
+    Returns:
+        Dictionary representing embed
+    """
+    embed: Dict[str, Any] = {}
+
+    if title:
+        embed["title"] = title
+
+    if description:
+        embed["description"] = description
+
+    if color:
+        embed["color"] = int(color)
+
+    if timestamp:
+        embed["timestamp"] = utc_now_iso()
+
+    if footer:
+        embed["footer"] = {"text": footer}
+
+    if thumbnail:
+        embed["thumbnail"] = {"url": thumbnail}
+
+    if image:
+        embed["image"] = {"url": image}
+
+    if fields:
+        embed["fields"] = fields
+
+    return embed
+
+
+def _basic_embed(title: Optional[str], description: Optional[str], color: int) -> Dict[str, Any]:
+    """Title/description/color/timestamp embed; like embed_create, falsy text fields are left out"""
+    embed: Dict[str, Any] = {}
+    if title:
+        embed["title"] = title
+    if description:
+        embed["description"] = description
+    embed["color"] = color
+    embed["timestamp"] = utc_now_iso()
+    return embed
+
+
+def embed_success(title: str, description: str) -> Dict[str, Any]:
+    """Create success embed"""
+    return _basic_embed(f"✅ {title}", description, _C_SUCCESS)
+
+
+def embed_error(title: str, description: str) -> Dict[str, Any]:
+    """Create error embed"""
+    return _basic_embed(f"❌ {title}", description, _C_ERROR)
+
+
+def embed_warning(title: str, description: str) -> Dict[str, Any]:
+    """Create warning embed"""
+    return _basic_embed(f"⚠️ {title}", description, _C_WARNING)
+
+
+def embed_info(title: str, description: str) -> Dict[str, Any]:
+    """Create info embed"""
+    return _basic_embed(f"ℹ️ {title}", description, _C_INFO)
+
+
+def embed_ai_response(message: str, model: str = "AI") -> Dict[str, Any]:
+    """Create AI response embed"""
+    embed = _basic_embed("🤖 AI Response", message, _C_AI)
+    embed["footer"] = {"text": f"Powered by {model}"}
+    return embed
+
+
+def embed_level_up(user_id: str, username: str, new_level: int, xp: int) -> Dict[str, Any]:
+    """Create level up embed (Stoat format)"""
+    return {
+        "title": "Level Up!",
+        "description": f"<@{user_id}> just reached **Level {new_level}**!\nTotal XP: **{xp:,}**",
+        "color": _C_LEVELING,
+        "timestamp": utc_now_iso()
+    }
+
+
+def embed_rank_card(
+    user_id: str,
+    username: str,
+    level: int,
+    xp: int,
+    rank: int,
+    next_level_xp: int
+) -> Dict[str, Any]:
+    """Create rank card embed (Stoat format)"""
+    level_xp = xp % next_level_xp
+    progress = level_xp / next_level_xp * 100
+    filled = int(progress / 10)
+    progress_bar = _BARS[filled if filled <= 10 else 10]
+
+    return {
+        "title": f"Rank — {username}",
+        "description": (
+            f"Rank **#{rank}** | Level **{level}**\n"
+            f"XP: **{level_xp:,} / {next_level_xp:,}**\n"
+            f"{progress_bar} {progress:.1f}%"
+        ),
+        "color": _C_LEVELING,
+        "timestamp": utc_now_iso()
+    }
+
+
+def embed_economy_balance(
+    user_id: str,
+    username: str,
+    balance: int,
+    currency_symbol: str = "💎"
+) -> Dict[str, Any]:
+    """Create balance embed (Stoat format)"""
+    return {
+        "title": "Balance",
+        "description": f"<@{user_id}>'s balance: **{currency_symbol} {balance:,}**",
+        "color": _C_ECONOMY,
+        "timestamp": utc_now_iso()
+    }
+
+
+def embed_moderation_action(
+    action: str,
+    user_id: str,
+    username: str,
+    moderator_id: str,
+    moderator_name: str,
+    reason: str
+) -> Dict[str, Any]:
+    """Create moderation action embed (Stoat format)"""
+    return _basic_embed(
+        action,
+        (
+            f"**User:** <@{user_id}>\n"
+            f"**Moderator:** <@{moderator_id}>\n"
+            f"**Reason:** {reason}"
+        ),
+        _C_WARNING
+    )
+
+
+def embed_verification_prompt() -> Dict[str, Any]:
+    """Create verification prompt embed"""
+    return {
+        "title": "🔐 Verification Required",
+        "description": "Click the button below to verify and gain access to the server.",
+        "color": _C_PRIMARY,
+        "timestamp": utc_now_iso(),
+        "footer": {"text": "Complete verification to unlock all channels"}
+    }
+
+
+def embed_ticket_created(ticket_id: str, category: str) -> Dict[str, Any]:
+    """Create ticket created embed"""
+    return {
+        "title": "Ticket Created",
+        "description": f"Your support ticket has been created!\n**ID:** `{ticket_id}`\n**Category:** {category}",
+        "color": _C_SUCCESS,
+        "timestamp": utc_now_iso()
+    }
+
+
+def embed_leaderboard(
+    title: str,
+    entries: List[Dict[str, Any]],
+    field_name: str = "Rank",
+    color: int = _C_LEVELING
+) -> Dict[str, Any]:
+    """Create leaderboard embed"""
+    description = "".join([
+        f"{_MEDALS[i] if i < 3 else f'{i + 1}.'} "
+        f"<@{entry.get('user_id', 'Unknown')}> - **{entry.get(field_name, 0):,}**\n"
+        for i, entry in enumerate(entries[:10])
+    ])
+
+    return embed_create(
+        title=f"🏆 {title}",
+        description=description or "No entries yet",
+        color=color
+    )
+
+
+def embed_welcome(username: str, user_id: str) -> Dict[str, Any]:
+    """Create welcome embed (Stoat format)"""
+    return {
+        "title": f"Welcome {username}!",
+        "description": f"Thanks for joining our server, <@{user_id}>!",
+        "color": _C_SUCCESS
+    }
+
+
 class EmbedFactory:
-    """Factory for creating themed embeds (Stoat-only - returns dicts)"""
-
-    @staticmethod
-    def create(
-        title: Optional[str] = None,
-        description: Optional[str] = None,
-        color: int = EmbedColor.PRIMARY,
-        footer: Optional[str] = None,
-        thumbnail: Optional[str] = None,
-        image: Optional[str] = None,
-        fields: Optional[List[Dict[str, Any]]] = None,
-        timestamp: bool = True
-    ) -> Dict[str, Any]:
-        """
-        Create a custom embed dictionary
-
-        Args:
-            title: Embed title
-            description: Embed description
-            color: Embed color (hex)
-            footer: Footer text
-            thumbnail: Thumbnail URL
-            image: Image URL
-            fields: List of field dictionaries
-            timestamp: Whether to add timestamp
-
-        Returns:
-            Dictionary representing embed
-        """
-        embed: Dict[str, Any] = {}
-
-        if title:
-            embed["title"] = title
-
-        if description:
-            embed["description"] = description
-
-        if color:
-            embed["color"] = color
-
-        if timestamp:
-            embed["timestamp"] = datetime.utcnow().isoformat()
-
-        if footer:
-            embed["footer"] = {"text": footer}
-
-        if thumbnail:
-            embed["thumbnail"] = {"url": thumbnail}
-
-        if image:
-            embed["image"] = {"url": image}
-
-        if fields:
-            embed["fields"] = fields
-
-        return embed
-
-    @staticmethod
-    def success(title: str, description: str) -> Dict[str, Any]:
-        """Create success embed"""
-        return EmbedFactory.create(
-            title=f"✅ {title}",
-            description=description,
-            color=EmbedColor.SUCCESS
-        )
-
-    @staticmethod
-    def error(title: str, description: str) -> Dict[str, Any]:
-        """Create error embed"""
-        return EmbedFactory.create(
-            title=f"❌ {title}",
-            description=description,
-            color=EmbedColor.ERROR
-        )
-
-    @staticmethod
-    def warning(title: str, description: str) -> Dict[str, Any]:
-        """Create warning embed"""
-        return EmbedFactory.create(
-            title=f"⚠️ {title}",
-            description=description,
-            color=EmbedColor.WARNING
-        )
-
-    @staticmethod
-    def info(title: str, description: str) -> Dict[str, Any]:
-        """Create info embed"""
-        return EmbedFactory.create(
-            title=f"ℹ️ {title}",
-            description=description,
-            color=EmbedColor.INFO
-        )
-
-    @staticmethod
-    def ai_response(message: str, model: str = "AI") -> Dict[str, Any]:
-        """Create AI response embed"""
-        return EmbedFactory.create(
-            title="🤖 AI Response",
-            description=message,
-            color=EmbedColor.AI,
-            footer=f"Powered by {model}"
-        )
-
-    @staticmethod
-    def level_up(user_id: str, username: str, new_level: int, xp: int) -> Dict[str, Any]:
-        """Create level up embed (Stoat format)"""
-        return EmbedFactory.create(
-            title="Level Up!",
-            description=f"<@{user_id}> just reached **Level {new_level}**!\nTotal XP: **{xp:,}**",
-            color=EmbedColor.LEVELING,
-        )
-
-    @staticmethod
-    def rank_card(
-        user_id: str,
-        username: str,
-        level: int,
-        xp: int,
-        rank: int,
-        next_level_xp: int
-    ) -> Dict[str, Any]:
-        """Create rank card embed (Stoat format)"""
-        progress = (xp % next_level_xp) / next_level_xp * 100
-        progress_bar = "█" * int(progress / 10) + "░" * (10 - int(progress / 10))
-
-        return EmbedFactory.create(
-            title=f"Rank — {username}",
-            description=(
-                f"Rank **#{rank}** | Level **{level}**\n"
-                f"XP: **{xp % next_level_xp:,} / {next_level_xp:,}**\n"
-                f"{progress_bar} {progress:.1f}%"
-            ),
-            color=EmbedColor.LEVELING,
-        )
-
-    @staticmethod
-    def economy_balance(
-        user_id: str,
-        username: str,
-        balance: int,
-        currency_symbol: str = "💎"
-    ) -> Dict[str, Any]:
-        """Create balance embed (Stoat format)"""
-        return EmbedFactory.create(
-            title="Balance",
-            description=f"<@{user_id}>'s balance: **{currency_symbol} {balance:,}**",
-            color=EmbedColor.ECONOMY,
-        )
-
-    @staticmethod
-    def moderation_action(
-        action: str,
-        user_id: str,
-        username: str,
-        moderator_id: str,
-        moderator_name: str,
-        reason: str
-    ) -> Dict[str, Any]:
-        """Create moderation action embed (Stoat format)"""
-        return EmbedFactory.create(
-            title=action,
-            description=(
-                f"**User:** <@{user_id}>\n"
-                f"**Moderator:** <@{moderator_id}>\n"
-                f"**Reason:** {reason}"
-            ),
-            color=EmbedColor.WARNING,
-        )
-
-    @staticmethod
-    def verification_prompt() -> Dict[str, Any]:
-        """Create verification prompt embed"""
-        return EmbedFactory.create(
-            title="🔐 Verification Required",
-            description="Click the button below to verify and gain access to the server.",
-            color=EmbedColor.PRIMARY,
-            footer="Complete verification to unlock all channels"
-        )
-
-    @staticmethod
-    def ticket_created(ticket_id: str, category: str) -> Dict[str, Any]:
-        """Create ticket created embed"""
-        return EmbedFactory.create(
-            title="Ticket Created",
-            description=f"Your support ticket has been created!\n**ID:** `{ticket_id}`\n**Category:** {category}",
-            color=EmbedColor.SUCCESS,
-        )
-
-    @staticmethod
-    def leaderboard(
-        title: str,
-        entries: List[Dict[str, Any]],
-        field_name: str = "Rank",
-        color: int = EmbedColor.LEVELING
-    ) -> Dict[str, Any]:
-        """Create leaderboard embed"""
-        description = ""
-        for i, entry in enumerate(entries[:10], 1):
-            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-            user_id = entry.get('user_id', 'Unknown')
-            value = entry.get(field_name, 0)
-            description += f"{medal} <@{user_id}> - **{value:,}**\n"
-
-        return EmbedFactory.create(
-            title=f"🏆 {title}",
-            description=description or "No entries yet",
-            color=color
-        )
-
-    @staticmethod
-    def welcome(username: str, user_id: str) -> Dict[str, Any]:
-        """Create welcome embed (Stoat format)"""
-        return {
-            "title": f"Welcome {username}!",
-            "description": f"Thanks for joining our server, <@{user_id}>!",
-            "color": EmbedColor.SUCCESS
-        }
+    """Factory for creating themed embeds (Stoat-only - returns dicts)
+
+    Kept for existing callers; each builder is also available as a
+    module-level embed_* function, which skips the class attribute lookup.
+    """
+
+    create = staticmethod(embed_create)
+    success = staticmethod(embed_success)
+    error = staticmethod(embed_error)
+    warning = staticmethod(embed_warning)
+    info = staticmethod(embed_info)
+    ai_response = staticmethod(embed_ai_response)
+    level_up = staticmethod(embed_level_up)
+    rank_card = staticmethod(embed_rank_card)
+    economy_balance = staticmethod(embed_economy_balance)
+    moderation_action = staticmethod(embed_moderation_action)
+    verification_prompt = staticmethod(embed_verification_prompt)
+    ticket_created = staticmethod(embed_ticket_created)
+    leaderboard = staticmethod(embed_leaderboard)
+    welcome = staticmethod(embed_welcome)
@@ -3,9 +3,13 @@ Stoat Feature Flags - Pure Stoat feature management
 """
 
 import logging
-from typing import Dict, Optional, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
 from enum import Enum
 
+from utils.rollout import rollout_bucket, rollout_buckets
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,55 +22,68 @@ class FeatureStatus(str, Enum):
     ENABLED = "enabled"       # Fully enabled
 
 
+# Default Stoat features; read-only, instances keep their own overrides
+DEFAULT_FLAGS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    'verification': MappingProxyType({
+        'status': FeatureStatus.ENABLED,
+        'rollout': 100,
+        'description': 'User verification system'
+    }),
+    'moderation': MappingProxyType({
+        'status': FeatureStatus.ENABLED,
+        'rollout': 100,
+        'description': 'Moderation tools'
+    }),
+    'economy': MappingProxyType({
+        'status': FeatureStatus.GRADUAL,
+        'rollout': 50,
+        'description': 'Economy system'
+    }),
+    'leveling': MappingProxyType({
+        'status': FeatureStatus.GRADUAL,
+        'rollout': 50,
+        'description': 'XP leveling system'
+    }),
+    'tickets': MappingProxyType({
+        'status': FeatureStatus.BETA,
+        'rollout': 25,
+        'description': 'Support tickets'
+    }),
+    'giveaways': MappingProxyType({
+        'status': FeatureStatus.BETA,
+        'rollout': 25,
+        'description': 'Giveaway system'
+    }),
+    'social_alerts': MappingProxyType({
+        'status': FeatureStatus.INTERNAL,
+        'rollout': 5,
+        'description': 'Social media alerts (testing)'
+    }),
+    'ai_chat': MappingProxyType({
+        'status': FeatureStatus.INTERNAL,
+        'rollout': 10,
+        'description': 'AI chat integration (testing)'
+    }),
+})
+
+
 class StoatFeatureFlags:
     """Stoat-only feature flag manager"""
 
-    # Default Stoat features
-    DEFAULT_FLAGS = {
-        'verification': {
-            'status': FeatureStatus.ENABLED,
-            'rollout': 100,
-            'description': 'User verification system'
-        },
-        'moderation': {
-            'status': FeatureStatus.ENABLED,
-            'rollout': 100,
-            'description': 'Moderation tools'
-        },
-        'economy': {
-            'status': FeatureStatus.GRADUAL,
-            'rollout': 50,
-            'description': 'Economy system'
-        },
-        'leveling': {
-            'status': FeatureStatus.GRADUAL,
-            'rollout': 50,
-            'description': 'XP leveling system'
-        },
-        'tickets': {
-            'status': FeatureStatus.BETA,
-            'rollout': 25,
-            'description': 'Support tickets'
-        },
-        'giveaways': {
-            'status': FeatureStatus.BETA,
-            'rollout': 25,
-            'description': 'Giveaway system'
-        },
-        'social_alerts': {
-            'status': FeatureStatus.INTERNAL,
-            'rollout': 5,
-            'description': 'Social media alerts (testing)'
-        },
-        'ai_chat': {
-            'status': FeatureStatus.INTERNAL,
-            'rollout': 10,
-            'description': 'AI chat integration (testing)'
-        },
-    }
+    DEFAULT_FLAGS = DEFAULT_FLAGS
 
     def __init__(self):
-        self.flags = self.DEFAULT_FLAGS.copy()
+        # Changed flags only, copied from the defaults on first write
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+
+    def _flag(self, feature: str) -> Optional[Mapping[str, Any]]:
+        return self._overrides.get(feature) or DEFAULT_FLAGS.get(feature)
+
+    def _override(self, feature: str) -> Dict[str, Any]:
+        flag = self._overrides.get(feature)
+        if flag is None:
+            flag = self._overrides[feature] = dict(DEFAULT_FLAGS[feature])
+        return flag
 
     def is_enabled(
         self,
@@ -74,9 +91,9 @@ class StoatFeatureFlags:
         server_id: Optional[str] = None
     ) -> bool:
         """Check if feature is enabled for server"""
-        flag = self.flags.get(feature)
+        flag = self._flag(feature)
         if not flag:
-            logger.warning(f"Unknown feature flag: {feature}")
+            logger.warning("Unknown feature flag: %s", feature)
             return False
 
         status = flag.get('status', FeatureStatus.DISABLED)
@@ -88,33 +105,59 @@ class StoatFeatureFlags:
 
         # Gradual/Beta - use hash-based rollout
         if server_id:
-            rollout = flag.get('rollout', 0)
-            rollout_hash = hash(f"{server_id}_{feature}") % 100
-            return rollout_hash < rollout
+            return rollout_bucket(server_id, feature) < flag.get('rollout', 0)
 
         return False
 
+    def are_enabled(
+        self,
+        features: List[str],
+        server_id: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """Check several features for one server in a single call"""
+        result = {}
+        rollouts = {}
+        for feature in features:
+            flag = self._flag(feature)
+            status = flag.get('status', FeatureStatus.DISABLED) if flag else FeatureStatus.DISABLED
+            if status == FeatureStatus.ENABLED:
+                result[feature] = True
+            elif status == FeatureStatus.DISABLED or not server_id:
+                if not flag:
+                    logger.warning("Unknown feature flag: %s", feature)
+                result[feature] = False
+            else:
+                rollouts[feature] = flag.get('rollout', 0)
+
+        if rollouts:
+            for feature, bucket in rollout_buckets(server_id, list(rollouts)).items():
+                result[feature] = bucket < rollouts[feature]
+
+        return result
+
     def get_status(self, feature: str) -> Optional[str]:
         """Get feature status"""
-        flag = self.flags.get(feature)
+        flag = self._flag(feature)
         return flag.get('status', FeatureStatus.DISABLED).value if flag else None
 
     def set_status(self, feature: str, status: FeatureStatus) -> None:
         """Set feature status"""
-        if feature in self.flags:
-            self.flags[feature]['status'] = status
-            logger.info(f"Feature '{feature}' status: {status.value}")
+        if feature in DEFAULT_FLAGS:
+            self._override(feature)['status'] = status
+            is_feature_enabled.cache_clear()
+            logger.info("Feature '%s' status: %s", feature, status.value)
 
     def set_rollout(self, feature: str, percentage: int) -> None:
         """Set rollout percentage"""
-        if feature in self.flags:
+        if feature in DEFAULT_FLAGS:
             percentage = max(0, min(100, percentage))
-            self.flags[feature]['rollout'] = percentage
-            logger.info(f"Feature '{feature}' rollout: {percentage}%")
+            self._override(feature)['rollout'] = percentage
+            is_feature_enabled.cache_clear()
+            logger.info("Feature '%s' rollout: %s%%", feature, percentage)
 
     def get_all_features(self) -> Dict[str, Any]:
-        """Get all features with status"""
-        return self.flags.copy()
+        """Get all features with status, as mutable copies"""
+        return {feature: dict(flag) for feature, flag in {**DEFAULT_FLAGS, **self._overrides}.items()}
 
 
 # Global instance
@@ -129,7 +172,8 @@ def get_feature_flags() -> StoatFeatureFlags:
     return _global_flags
 
 
+@lru_cache(maxsize=65536)
 def is_feature_enabled(feature: str, server_id: Optional[str] = None) -> bool:
-    """Convenience function to check feature"""
+    """Convenience function to check feature (cached until flags change)"""
     flags = get_feature_flags()
     return flags.is_enabled(feature, server_id)
\ No newline at end of file
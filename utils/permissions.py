@@ -3,8 +3,11 @@ Permission utilities for Logiq (Stoat-only)
 Database-driven permission checking (NO Discord)
 """
 
+import asyncio
 import logging
-from typing import Optional, Tuple
+import time
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -14,37 +17,37 @@ logger = logging.getLogger(__name__)
 async def is_admin(db, guild_id: str, user_id: str) -> bool:
     """Check if user is server admin (Stoat)"""
     try:
-        member = await db.get_member(guild_id, user_id)
+        member = await _get_member(db, guild_id, user_id)
         if not member:
             return False
         return member.get("is_admin", False)
     except Exception as e:
-        logger.error(f"Admin check error: {e}")
+        logger.error("Admin check error: %s", e)
         return False
 
 
 async def is_mod(db, guild_id: str, user_id: str) -> bool:
     """Check if user is moderator (Stoat)"""
     try:
-        member = await db.get_member(guild_id, user_id)
+        member = await _get_member(db, guild_id, user_id)
         if not member:
             return False
         return member.get("is_mod", False) or member.get("is_admin", False)
     except Exception as e:
-        logger.error(f"Mod check error: {e}")
+        logger.error("Mod check error: %s", e)
         return False
 
 
 async def has_role(db, guild_id: str, user_id: str, role_id: str) -> bool:
     """Check if user has role"""
     try:
-        member = await db.get_member(guild_id, user_id)
+        member = await _get_member(db, guild_id, user_id)
         if not member:
             return False
         roles = member.get("roles", [])
         return role_id in roles
     except Exception as e:
-        logger.error(f"Role check error: {e}")
+        logger.error("Role check error: %s", e)
         return False
 
 
@@ -56,12 +59,101 @@ async def is_guild_owner(db, guild_id: str, user_id: str) -> bool:
             return False
         return guild.get("owner_id") == user_id
     except Exception as e:
-        logger.error(f"Guild owner check error: {e}")
+        logger.error("Guild owner check error: %s", e)
         return False
 
 
 # ========== PERMISSION CHECKER CLASS ==========
 
+# Minimum permission level (see get_permission_level) for each named permission
+_PERM_LEVEL: Mapping[str, int] = MappingProxyType({
+    "ban_members": 2,
+    "kick_members": 2,
+    "manage_members": 2,
+    "manage_roles": 2,
+    "manage_channels": 2,
+    "manage_messages": 2,
+    "mute_members": 1,
+    "deafen_members": 1,
+    "send_messages": 0,
+    "read_messages": 0,
+})
+
+# Guild owners rarely change; cache them as guild_id -> (fetched_at, owner_id)
+OWNER_CACHE_TTL = 60.0
+_owner_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+
+# Member documents, (guild_id, user_id) -> (fetched_at, member); dropped by
+# PermissionChecker.invalidate when the member's roles or flags change
+MEMBER_CACHE_TTL = 45.0
+MEMBER_CACHE_SIZE = 200_000
+_member_cache: Dict[Tuple[str, str], Tuple[float, Optional[dict]]] = {}
+
+# Lookups currently in flight; concurrent identical requests share one query
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+
+async def _singleflight(key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Await fetch(), or the already-running fetch for the same key"""
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(fetch())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the query for the others
+    return await asyncio.shield(future)
+
+
+async def _get_member(db, guild_id: str, user_id: str) -> Optional[dict]:
+    """Member document, served from the TTL cache when fresh"""
+    key = (guild_id, user_id)
+    cached = _member_cache.get(key)
+    if cached and time.monotonic() - cached[0] < MEMBER_CACHE_TTL:
+        return cached[1]
+
+    member = await _singleflight(("mem", id(db), guild_id, user_id), lambda: db.get_member(guild_id, user_id))
+    _store_member(key, member)
+    return member
+
+
+def _store_member(key: Tuple[str, str], member: Optional[dict]) -> None:
+    """Cache a member document, evicting the oldest entry once MEMBER_CACHE_SIZE is reached"""
+    if key not in _member_cache and len(_member_cache) >= MEMBER_CACHE_SIZE:
+        _member_cache.pop(next(iter(_member_cache)))
+    _member_cache[key] = (time.monotonic(), member)
+
+
+def _get_guild(db, guild_id: str) -> Awaitable[Optional[dict]]:
+    return _singleflight(("guild", id(db), guild_id), lambda: db.get_guild(guild_id))
+
+
+def _cached_owner(guild_id: str) -> Tuple[bool, Optional[str]]:
+    """(hit, owner_id) from the owner cache"""
+    cached = _owner_cache.get(guild_id)
+    if cached and time.monotonic() - cached[0] < OWNER_CACHE_TTL:
+        return True, cached[1]
+    return False, None
+
+
+def _store_owner(guild_id: str, guild: Optional[dict]) -> Optional[str]:
+    owner_id = guild.get("owner_id") if guild else None
+    _owner_cache[guild_id] = (time.monotonic(), owner_id)
+    return owner_id
+
+
+def _level_from(guild: Optional[dict], member: Optional[dict], user_id: str) -> int:
+    """Permission level (0-3) from already-fetched guild and member documents"""
+    if guild and guild.get("owner_id") == user_id:
+        return 3
+    if not member:
+        return 0
+    if member.get("is_admin", False):
+        return 2
+    if member.get("is_mod", False):
+        return 1
+    return 0
+
+
 class PermissionChecker:
     """Utility class for permission checking (Stoat-only)"""
 
@@ -89,8 +181,18 @@ class PermissionChecker:
             if moderator_id == target_id:
                 return False, "You cannot moderate yourself"
 
+            # Moderator and guild owner concurrently (owner usually comes from cache)
+            hit, owner_id = _cached_owner(guild_id)
+            if hit:
+                mod_member = await _get_member(db, guild_id, moderator_id)
+            else:
+                mod_member, guild = await asyncio.gather(
+                    _get_member(db, guild_id, moderator_id),
+                    _get_guild(db, guild_id)
+                )
+                owner_id = _store_owner(guild_id, guild)
+
             # Check if moderator is admin or mod
-            mod_member = await db.get_member(guild_id, moderator_id)
             if not mod_member:
                 return False, "You have no permissions"
 
@@ -99,16 +201,25 @@ class PermissionChecker:
                 return False, "You are not a moderator or admin"
 
             # Check if target is owner
-            guild = await db.get_guild(guild_id)
-            if guild and guild.get("owner_id") == target_id:
+            if owner_id == target_id:
                 return False, "You cannot moderate the server owner"
 
             return True, None
 
         except Exception as e:
-            logger.error(f"Can moderate check error: {e}")
+            logger.error("Can moderate check error: %s", e)
             return False, "Permission check failed"
 
+    @staticmethod
+    def invalidate(guild_id: str, user_id: Optional[str] = None) -> None:
+        """Drop cached permission data for a member, or for a whole guild"""
+        if user_id is not None:
+            _member_cache.pop((guild_id, user_id), None)
+            return
+        _owner_cache.pop(guild_id, None)
+        for key in [k for k in _member_cache if k[0] == guild_id]:
+            del _member_cache[key]
+
     @staticmethod
     async def get_permission_level(db, guild_id: str, user_id: str) -> int:
         """
@@ -127,25 +238,59 @@ class PermissionChecker:
             Permission level (0-3)
         """
         try:
-            guild = await db.get_guild(guild_id)
-            if guild and guild.get("owner_id") == user_id:
-                return 3
-
-            member = await db.get_member(guild_id, user_id)
-            if not member:
-                return 0
-
-            if member.get("is_admin", False):
-                return 2
-
-            if member.get("is_mod", False):
-                return 1
+            hit, owner_id = _cached_owner(guild_id)
+            if hit:
+                if owner_id == user_id:
+                    return 3
+                member = await _get_member(db, guild_id, user_id)
+            else:
+                guild, member = await asyncio.gather(
+                    _get_guild(db, guild_id),
+                    _get_member(db, guild_id, user_id)
+                )
+                owner_id = _store_owner(guild_id, guild)
+
+            return _level_from({"owner_id": owner_id}, member, user_id)
 
+        except Exception as e:
+            logger.error("Get permission level error: %s", e)
             return 0
 
+    @staticmethod
+    async def get_permission_levels_bulk(db, guild_id: str, user_ids: List[str]) -> Dict[str, int]:
+        """Permission levels for several users; cache misses share one member query"""
+        try:
+            now = time.monotonic()
+            members: Dict[str, Optional[dict]] = {}
+            misses = []
+            for user_id in user_ids:
+                cached = _member_cache.get((guild_id, user_id))
+                if cached and now - cached[0] < MEMBER_CACHE_TTL:
+                    members[user_id] = cached[1]
+                else:
+                    misses.append(user_id)
+
+            # Missing members and (if not cached) the guild owner, concurrently
+            hit, owner_id = _cached_owner(guild_id)
+            lookups = [db.get_members(guild_id, misses)] if misses else []
+            if not hit:
+                lookups.append(_get_guild(db, guild_id))
+            results = await asyncio.gather(*lookups)
+            if not hit:
+                owner_id = _store_owner(guild_id, results.pop())
+
+            if misses:
+                by_id = {m.get("user_id"): m for m in results[0]}
+                for user_id in misses:
+                    member = members[user_id] = by_id.get(user_id)
+                    _store_member((guild_id, user_id), member)
+
+            owner = {"owner_id": owner_id}
+            return {user_id: _level_from(owner, members[user_id], user_id) for user_id in user_ids}
+
         except Exception as e:
-            logger.error(f"Get permission level error: {e}")
-            return 0
+            logger.error("Get permission levels error: %s", e)
+            return {user_id: 0 for user_id in user_ids}
 
     @staticmethod
     async def check_hierarchy(
@@ -155,13 +300,9 @@ class PermissionChecker:
         target_id: str
     ) -> bool:
         """Check if executor is higher in hierarchy than target (Stoat)"""
-        try:
-            executor_level = await PermissionChecker.get_permission_level(db, guild_id, executor_id)
-            target_level = await PermissionChecker.get_permission_level(db, guild_id, target_id)
-            return executor_level > target_level
-        except Exception as e:
-            logger.error(f"Check hierarchy error: {e}")
-            return False
+        # get_permission_levels_bulk handles its own errors (returning level 0)
+        levels = await PermissionChecker.get_permission_levels_bulk(db, guild_id, [executor_id, target_id])
+        return levels[executor_id] > levels[target_id]
 
     @staticmethod
     async def has_permission(
@@ -171,30 +312,12 @@ class PermissionChecker:
         permission: str
     ) -> bool:
         """Check if user has specific permission (Stoat)"""
-        try:
-            permission = permission.lower()
-
-            permissions_map = {
-                "ban_members": 2,
-                "kick_members": 2,
-                "manage_members": 2,
-                "manage_roles": 2,
-                "manage_channels": 2,
-                "manage_messages": 2,
-                "mute_members": 1,
-                "deafen_members": 1,
-                "send_messages": 0,
-                "read_messages": 0,
-            }
-
-            required_level = permissions_map.get(permission, 0)
-            user_level = await PermissionChecker.get_permission_level(db, guild_id, user_id)
-
-            return user_level >= required_level
-
-        except Exception as e:
-            logger.error(f"Has permission check error: {e}")
+        if not isinstance(permission, str):
+            logger.error("Has permission check error: invalid permission %r", permission)
             return False
+        # get_permission_level handles its own errors (returning level 0)
+        required_level = _PERM_LEVEL.get(permission.lower(), 0)
+        return await PermissionChecker.get_permission_level(db, guild_id, user_id) >= required_level
 
     @staticmethod
     async def get_members_with_role(
@@ -203,12 +326,13 @@ class PermissionChecker:
         role_id: str,
         limit: int = 100
     ) -> list:
-        """Get all members with specific role (Stoat)"""
+        """Get all members with specific role (Stoat), as {"user_id": ...} documents"""
         try:
-            return await db.db.members.find({
-                "guild_id": guild_id,
-                "roles": role_id
-            }).to_list(length=limit)
+            # Served by the (guild_id, roles) multikey index; only user_id is returned
+            return await db.db.members.find(
+                {"guild_id": guild_id, "roles": role_id},
+                {"user_id": 1, "_id": 0}
+            ).to_list(length=limit)
         except Exception as e:
-            logger.error(f"Get members with role error: {e}")
+            logger.error("Get members with role error: %s", e)
             return []
\ No newline at end of file
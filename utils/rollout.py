@@ -4,14 +4,53 @@ Manages server enrollment in beta/gradual features
 """
 
 import logging
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, asdict
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
 from enum import Enum
-import json
 from datetime import datetime
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+_EMPTY: frozenset = frozenset()
+
+# Upper bound on cached (feature, server_id) decisions; oldest are evicted first
+DECISION_CACHE_SIZE = 100_000
+
+# Encoded b"\0<feature>" suffixes, built once per feature
+_feature_keys: Dict[str, bytes] = {}
+
+
+def _feature_key(feature: str) -> bytes:
+    key = _feature_keys.get(feature)
+    if key is None:
+        key = _feature_keys[feature] = b"\0" + feature.encode()
+    return key
+
+
+def rollout_bucket(server_id: str, feature: str) -> int:
+    """Stable 0-99 rollout bucket for a server/feature pair
+
+    Unlike hash(), the result does not change between processes, so servers
+    keep their place in a gradual rollout across restarts. The bucket does not
+    depend on the percentage either: raising a rollout only adds servers.
+    """
+    digest = blake2b(server_id.encode() + _feature_key(feature), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % 100
+
+
+def rollout_buckets(server_id: str, features: List[str]) -> Dict[str, int]:
+    """rollout_bucket for several features, hashing the server id only once"""
+    base = blake2b(server_id.encode(), digest_size=8)
+    buckets = {}
+    for feature in features:
+        h = base.copy()
+        h.update(_feature_key(feature))
+        buckets[feature] = int.from_bytes(h.digest(), "little") % 100
+    return buckets
+
 
 class RolloutPhase(str, Enum):
     """Stoat rollout phases"""
@@ -22,7 +61,21 @@ class RolloutPhase(str, Enum):
     DEPRECATED = "deprecated"  # Being phased out
 
 
-@dataclass
+# Position of each phase in the rollout pipeline, and the phase that follows it
+_PHASE_INDEX: Dict[RolloutPhase, int] = {
+    RolloutPhase.INTERNAL: 0,
+    RolloutPhase.BETA: 1,
+    RolloutPhase.GRADUAL: 2,
+    RolloutPhase.STABLE: 3,
+}
+_NEXT_PHASE: Dict[RolloutPhase, RolloutPhase] = {
+    RolloutPhase.INTERNAL: RolloutPhase.BETA,
+    RolloutPhase.BETA: RolloutPhase.GRADUAL,
+    RolloutPhase.GRADUAL: RolloutPhase.STABLE,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class ServerEnrollment:
     """Server enrollment in rollout"""
     server_id: str
@@ -58,6 +111,12 @@ class StoatRolloutManager:
         }
         self._whitelist: Dict[str, Set[str]] = {}
         self._blacklist: Dict[str, Set[str]] = {}
+        # (feature, server_id) -> decision; cleared per feature on any change
+        self._decision_cache: Dict[Tuple[str, str], bool] = {}
+        # Materialised export_config body; rebuilt after any change
+        self._export_cache: Optional[Dict] = None
+
+        self._update_phase_sets()
 
         logger.info("Stoat rollout manager initialized")
 
@@ -67,6 +126,86 @@ class StoatRolloutManager:
         server_id: str
     ) -> bool:
         """Check if server can use feature based on rollout phase"""
+        # Fixed answers for every server; also keeps them out of the cache
+        if feature in self._always_on:
+            return True
+        if feature in self._always_off:
+            return False
+
+        key = (feature, server_id)
+        decision = self._decision_cache.get(key)
+        if decision is None:
+            decision = self._remember(key, self._decide(feature, server_id))
+        return decision
+
+    async def can_use_features_bulk(
+        self,
+        features: List[str],
+        server_id: str
+    ) -> Dict[str, bool]:
+        """Check several features for one server in a single call"""
+        cache = self._decision_cache
+        always_on, always_off = self._always_on, self._always_off
+        result = {}
+        gradual = []
+        for feature in features:
+            # Same as can_use_feature: fixed answers never enter the cache
+            if feature in always_on or feature in always_off:
+                result[feature] = feature in always_on
+                continue
+
+            decision = cache.get((feature, server_id))
+            if decision is not None:
+                result[feature] = decision
+                continue
+
+            phase = self._phase_config.get(feature, RolloutPhase.INTERNAL)
+            if phase == RolloutPhase.GRADUAL and server_id not in self._blacklist.get(feature, ()):
+                gradual.append(feature)
+            else:
+                result[feature] = self._remember((feature, server_id), self._decide(feature, server_id))
+
+        if gradual:
+            percentages = self._rollout_percentages
+            for feature, bucket in rollout_buckets(server_id, gradual).items():
+                result[feature] = self._remember((feature, server_id), bucket < percentages.get(feature, 0))
+
+        return result
+
+    async def can_use_feature_bulk_servers(
+        self,
+        feature: str,
+        server_ids: Iterable[str]
+    ) -> List[str]:
+        """Return the servers from server_ids that can use feature"""
+        phase = self._phase_config.get(feature, RolloutPhase.INTERNAL)
+        if phase == RolloutPhase.STABLE:
+            return list(server_ids)
+        if phase not in (RolloutPhase.BETA, RolloutPhase.GRADUAL):
+            return []
+
+        blacklist = self._blacklist.get(feature, _EMPTY)
+        if phase == RolloutPhase.BETA:
+            whitelist = self._whitelist.get(feature, _EMPTY)
+            return [sid for sid in server_ids if sid in whitelist and sid not in blacklist]
+
+        percentage = self._rollout_percentages.get(feature, 0)
+        bucket = rollout_bucket
+        return [
+            sid for sid in server_ids
+            if sid not in blacklist and bucket(sid, feature) < percentage
+        ]
+
+    def _remember(self, key: Tuple[str, str], decision: bool) -> bool:
+        """Cache a decision, evicting the oldest once DECISION_CACHE_SIZE is reached"""
+        cache = self._decision_cache
+        if key not in cache and len(cache) >= DECISION_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = decision
+        return decision
+
+    def _decide(self, feature: str, server_id: str) -> bool:
+        """Evaluate phase, blacklist, whitelist and rollout bucket"""
         phase = self._phase_config.get(feature, RolloutPhase.INTERNAL)
 
         if phase == RolloutPhase.STABLE:
@@ -75,60 +214,79 @@ class StoatRolloutManager:
             return False
 
         # Check blacklist first
-        if server_id in self._blacklist.get(feature, set()):
-            logger.debug(f"Server {server_id} blacklisted from {feature}")
+        if server_id in self._blacklist.get(feature, _EMPTY):
+            logger.debug("Server %s blacklisted from %s", server_id, feature)
             return False
 
         # Check whitelist
         if phase == RolloutPhase.BETA:
-            is_whitelisted = server_id in self._whitelist.get(feature, set())
+            is_whitelisted = server_id in self._whitelist.get(feature, _EMPTY)
             if not is_whitelisted:
-                logger.debug(f"Server {server_id} not whitelisted for {feature}")
+                logger.debug("Server %s not whitelisted for %s", server_id, feature)
             return is_whitelisted
 
         # Gradual rollout
         if phase == RolloutPhase.GRADUAL:
-            percentage = self._rollout_percentages.get(feature, 0)
-            rollout_hash = hash(f"{server_id}_{feature}") % 100
-            return rollout_hash < percentage
+            return rollout_bucket(server_id, feature) < self._rollout_percentages.get(feature, 0)
 
         # Internal - not available to public
         return False
 
+    def _update_phase_sets(self) -> None:
+        """Recompute features whose answer doesn't depend on the server"""
+        phases = self._phase_config
+        self._always_on = frozenset(f for f, p in phases.items() if p == RolloutPhase.STABLE)
+        self._always_off = frozenset(
+            f for f, p in phases.items()
+            if p in (RolloutPhase.DEPRECATED, RolloutPhase.INTERNAL)
+        )
+
+    def _invalidate(self, feature: str) -> None:
+        """Drop cached decisions for a feature"""
+        self._export_cache = None
+        self._decision_cache = {k: v for k, v in self._decision_cache.items() if k[0] != feature}
+
     def set_phase(self, feature: str, phase: RolloutPhase) -> None:
         """Set rollout phase for feature"""
         self._phase_config[feature] = phase
-        logger.info(f"Feature '{feature}' set to phase: {phase.value}")
+        self._update_phase_sets()
+        self._invalidate(feature)
+        logger.info("Feature '%s' set to phase: %s", feature, phase.value)
 
     def set_rollout_percentage(self, feature: str, percentage: int) -> None:
         """Set gradual rollout percentage (0-100)"""
         percentage = max(0, min(100, percentage))
         self._rollout_percentages[feature] = percentage
-        logger.info(f"Feature '{feature}' rollout set to: {percentage}%")
+        self._invalidate(feature)
+        logger.info("Feature '%s' rollout set to: %s%%", feature, percentage)
 
     def add_whitelist(self, feature: str, server_id: str) -> None:
         """Add server to feature whitelist (beta access)"""
         if feature not in self._whitelist:
             self._whitelist[feature] = set()
         self._whitelist[feature].add(server_id)
-        logger.info(f"Server {server_id} whitelisted for {feature}")
+        self._invalidate(feature)
+        logger.info("Server %s whitelisted for %s", server_id, feature)
 
     def remove_whitelist(self, feature: str, server_id: str) -> None:
         """Remove server from whitelist"""
         if feature in self._whitelist:
             self._whitelist[feature].discard(server_id)
+            self._invalidate(feature)
 
     def add_blacklist(self, feature: str, server_id: str) -> None:
         """Block server from feature"""
         if feature not in self._blacklist:
             self._blacklist[feature] = set()
         self._blacklist[feature].add(server_id)
-        logger.info(f"Server {server_id} blacklisted from {feature}")
+        self._invalidate(feature)
+        logger.info("Server %s blacklisted from %s", server_id, feature)
 
     def remove_blacklist(self, feature: str, server_id: str) -> None:
         """Remove server from blacklist"""
         if feature in self._blacklist:
             self._blacklist[feature].discard(server_id)
+            self._invalidate(feature)
 
     def get_feature_status(self, feature: str) -> Dict[str, any]:
         """Get detailed status of feature rollout"""
@@ -139,8 +297,8 @@ class StoatRolloutManager:
             'feature': feature,
             'phase': phase.value,
             'percentage': percentage if phase == RolloutPhase.GRADUAL else (100 if phase == RolloutPhase.STABLE else 0),
-            'whitelisted': len(self._whitelist.get(feature, set())),
-            'blacklisted': len(self._blacklist.get(feature, set())),
+            'whitelisted': len(self._whitelist.get(feature, _EMPTY)),
+            'blacklisted': len(self._blacklist.get(feature, _EMPTY)),
         }
 
     def get_all_features_status(self) -> Dict[str, Dict]:
@@ -152,19 +310,20 @@ class StoatRolloutManager:
 
     def export_config(self) -> str:
         """Export rollout configuration as JSON"""
-        config = {
-            'phases': {k: v.value for k, v in self._phase_config.items()},
-            'percentages': self._rollout_percentages,
-            'whitelist': {k: list(v) for k, v in self._whitelist.items()},
-            'blacklist': {k: list(v) for k, v in self._blacklist.items()},
-            'exported_at': datetime.utcnow().isoformat()
-        }
-        return json.dumps(config, indent=2)
+        if self._export_cache is None:
+            self._export_cache = {
+                'phases': {k: v.value for k, v in self._phase_config.items()},
+                'percentages': dict(self._rollout_percentages),
+                'whitelist': {k: sorted(v) for k, v in self._whitelist.items()},
+                'blacklist': {k: sorted(v) for k, v in self._blacklist.items()},
+            }
+        config = {**self._export_cache, 'exported_at': datetime.utcnow().isoformat()}
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
 
     def import_config(self, config_json: str) -> None:
         """Import rollout configuration from JSON"""
         try:
-            config = json.loads(config_json)
+            config = orjson.loads(config_json)
             
             for feature, phase_str in config.get('phases', {}).items():
                 self._phase_config[feature] = RolloutPhase(phase_str)
@@ -179,48 +338,36 @@ class StoatRolloutManager:
 
             logger.info("Rollout config imported successfully")
         except Exception as e:
-            logger.error(f"Failed to import config: {e}")
+            logger.error("Failed to import config: %s", e)
+        finally:
+            # A failed import may still have applied some of the config
+            self._update_phase_sets()
+            self._decision_cache = {}
+            self._export_cache = None
 
     def get_phase_progress(self) -> Dict[str, Dict]:
         """Get progress through rollout phases"""
         progress = {}
         for feature, phase in self._phase_config.items():
+            next_phase = _NEXT_PHASE.get(phase)
             progress[feature] = {
                 'phase': phase.value,
                 'progress_percentage': self._get_progress_percentage(phase),
-                'next_phase': self._get_next_phase(phase).value if phase != RolloutPhase.STABLE else None,
+                'next_phase': next_phase.value if next_phase else None,
                 'eta': self._estimate_eta(feature, phase)
             }
         return progress
 
     def _get_progress_percentage(self, phase: RolloutPhase) -> int:
         """Get progress through phase"""
-        phase_order = [
-            RolloutPhase.INTERNAL,
-            RolloutPhase.BETA,
-            RolloutPhase.GRADUAL,
-            RolloutPhase.STABLE
-        ]
         if phase == RolloutPhase.DEPRECATED:
             return 100
-        try:
-            return (phase_order.index(phase) + 1) / len(phase_order) * 100
-        except ValueError:
-            return 0
+        index = _PHASE_INDEX.get(phase)
+        return 0 if index is None else (index + 1) * 100 // len(_PHASE_INDEX)
 
     def _get_next_phase(self, current: RolloutPhase) -> Optional[RolloutPhase]:
         """Get next phase in rollout"""
-        phase_order = [
-            RolloutPhase.INTERNAL,
-            RolloutPhase.BETA,
-            RolloutPhase.GRADUAL,
-            RolloutPhase.STABLE
-        ]
-        try:
-            current_idx = phase_order.index(current)
-            return phase_order[current_idx + 1] if current_idx < len(phase_order) - 1 else None
-        except ValueError:
-            return None
+        return _NEXT_PHASE.get(current)
 
     def _estimate_eta(self, feature: str, phase: RolloutPhase) -> Optional[str]:
         """Estimate time to next phase"""
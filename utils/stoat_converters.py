@@ -6,6 +6,8 @@ Stoat-only conversions (NO Discord conversion)
 from typing import Any, Dict, Optional
 from datetime import datetime
 
+from utils.timestamps import utc_now_iso
+
 
 class IDConverter:
     """Convert and normalize IDs to Stoat format (string-based)"""
@@ -22,10 +24,10 @@ class IDConverter:
 
     @staticmethod
     def validate_id(value: str) -> bool:
-        """Validate ID format"""
-        if not isinstance(value, str):
-            return False
-        return len(value) > 0 and value.isalnum()
+        """Validate ID format (non-empty ASCII letters and digits, e.g. a ULID)"""
+        # isascii() is a flag check on the string object, so it costs nothing
+        # and keeps non-ASCII letters/digits (which isalnum() accepts) out
+        return isinstance(value, str) and value.isascii() and value.isalnum()
 
 
 class PayloadConverter:
@@ -34,26 +36,28 @@ class PayloadConverter:
     @staticmethod
     def stoat_user_to_dict(stoat_user: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Stoat user payload to normalized dict"""
+        get = stoat_user.get
         return {
-            "id": stoat_user.get("_id") or stoat_user.get("id"),
-            "username": stoat_user.get("username"),
-            "avatar": stoat_user.get("avatar_url"),
-            "display_name": stoat_user.get("display_name") or stoat_user.get("username"),
-            "bot": stoat_user.get("bot", False),
-            "created_at": stoat_user.get("created_at"),
-            "status": stoat_user.get("status", "offline"),
+            "id": get("_id") or get("id"),
+            "username": get("username"),
+            "avatar": get("avatar_url"),
+            "display_name": get("display_name") or get("username"),
+            "bot": get("bot", False),
+            "created_at": get("created_at"),
+            "status": get("status", "offline"),
         }
 
     @staticmethod
     def stoat_member_to_dict(stoat_member: Dict[str, Any], include_user: bool = True) -> Dict[str, Any]:
         """Convert Stoat member payload to normalized dict"""
+        get = stoat_member.get
         member = {
-            "guild_id": stoat_member.get("server_id") or stoat_member.get("guild_id"),
-            "user_id": stoat_member.get("user_id") or stoat_member.get("_id", {}).get("user"),
-            "roles": stoat_member.get("roles", []),
-            "nickname": stoat_member.get("nickname"),
-            "joined_at": stoat_member.get("joined_at"),
-            "permissions": stoat_member.get("permissions", 0),
+            "guild_id": get("server_id") or get("guild_id"),
+            "user_id": get("user_id") or get("_id", {}).get("user"),
+            "roles": get("roles", []),
+            "nickname": get("nickname"),
+            "joined_at": get("joined_at"),
+            "permissions": get("permissions", 0),
         }
         if include_user and "user" in stoat_member:
             member["user"] = PayloadConverter.stoat_user_to_dict(stoat_member["user"])
@@ -62,57 +66,61 @@ class PayloadConverter:
     @staticmethod
     def stoat_guild_to_dict(stoat_guild: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Stoat guild/server payload to normalized dict"""
+        get = stoat_guild.get
         return {
-            "id": stoat_guild.get("_id") or stoat_guild.get("id"),
-            "name": stoat_guild.get("name"),
-            "icon": stoat_guild.get("icon_url"),
-            "owner_id": stoat_guild.get("owner"),
-            "member_count": stoat_guild.get("member_count", 0),
-            "created_at": stoat_guild.get("created_at"),
-            "features": stoat_guild.get("features", []),
-            "description": stoat_guild.get("description", ""),
+            "id": get("_id") or get("id"),
+            "name": get("name"),
+            "icon": get("icon_url"),
+            "owner_id": get("owner"),
+            "member_count": get("member_count", 0),
+            "created_at": get("created_at"),
+            "features": get("features", []),
+            "description": get("description", ""),
         }
 
     @staticmethod
     def stoat_channel_to_dict(stoat_channel: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Stoat channel payload to normalized dict"""
+        get = stoat_channel.get
         return {
-            "id": stoat_channel.get("_id") or stoat_channel.get("id"),
-            "name": stoat_channel.get("name"),
-            "type": stoat_channel.get("channel_type") or stoat_channel.get("type"),
-            "guild_id": stoat_channel.get("server") or stoat_channel.get("guild_id"),
-            "position": stoat_channel.get("position", 0),
-            "topic": stoat_channel.get("topic"),
-            "nsfw": stoat_channel.get("nsfw", False),
+            "id": get("_id") or get("id"),
+            "name": get("name"),
+            "type": get("channel_type") or get("type"),
+            "guild_id": get("server") or get("guild_id"),
+            "position": get("position", 0),
+            "topic": get("topic"),
+            "nsfw": get("nsfw", False),
         }
 
     @staticmethod
     def stoat_role_to_dict(stoat_role: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Stoat role payload to normalized dict"""
+        get = stoat_role.get
         return {
-            "id": stoat_role.get("_id") or stoat_role.get("id"),
-            "name": stoat_role.get("name"),
-            "color": stoat_role.get("colour") or stoat_role.get("color", 0),
-            "position": stoat_role.get("rank", 0),
-            "permissions": stoat_role.get("permissions", 0),
-            "hoist": stoat_role.get("hoist", False),
-            "mentionable": stoat_role.get("mentionable", False),
+            "id": get("_id") or get("id"),
+            "name": get("name"),
+            "color": get("colour") or get("color", 0),
+            "position": get("rank", 0),
+            "permissions": get("permissions", 0),
+            "hoist": get("hoist", False),
+            "mentionable": get("mentionable", False),
         }
 
     @staticmethod
     def stoat_message_to_dict(stoat_msg: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Stoat message payload to normalized dict"""
+        get = stoat_msg.get
         return {
-            "id": stoat_msg.get("_id") or stoat_msg.get("id"),
-            "content": stoat_msg.get("content"),
-            "author_id": stoat_msg.get("author"),
-            "guild_id": stoat_msg.get("server") or stoat_msg.get("guild_id"),
-            "channel_id": stoat_msg.get("channel"),
-            "timestamp": stoat_msg.get("timestamp"),
-            "edited_timestamp": stoat_msg.get("edited_timestamp"),
-            "embeds": stoat_msg.get("embeds", []),
-            "attachments": stoat_msg.get("attachments", []),
-            "reactions": stoat_msg.get("reactions", {}),
+            "id": get("_id") or get("id"),
+            "content": get("content"),
+            "author_id": get("author"),
+            "guild_id": get("server") or get("guild_id"),
+            "channel_id": get("channel"),
+            "timestamp": get("timestamp"),
+            "edited_timestamp": get("edited_timestamp"),
+            "embeds": get("embeds", []),
+            "attachments": get("attachments", []),
+            "reactions": get("reactions", {}),
         }
 
 
@@ -146,7 +154,7 @@ class SchemaHelpers:
             "inventory": user_data.get("inventory", []),
             "warnings": user_data.get("warnings", []),
             "tags": user_data.get("tags", []),
-            "created_at": user_data.get("created_at", datetime.utcnow().isoformat()),
+            "created_at": user_data["created_at"] if "created_at" in user_data else utc_now_iso(),
         }
 
     @staticmethod
@@ -160,4 +168,4 @@ class SchemaHelpers:
             try:
                 return datetime.fromtimestamp(timestamp).isoformat()
             except Exception:
-                return datetime.utcnow().isoformat()
\ No newline at end of file
+                return utc_now_iso()
\ No newline at end of file
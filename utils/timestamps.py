@@ -0,0 +1,28 @@
+"""
+Timestamp helpers for Logiq (Stoat-only)
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Tuple
+
+# Last formatted second as (epoch_second, iso_string); swapped as one tuple so
+# threaded callers (the health check server) never see a half-updated pair
+_last: Tuple[int, str] = (0, "")
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as a naive ISO 8601 string, at one-second resolution
+
+    Same shape as datetime.utcnow().isoformat() (no offset), which stored
+    created_at values already use. Calls within the same second share one
+    formatted string, which keeps bursts of embeds, payloads and health
+    probes off datetime formatting.
+    """
+    global _last
+    sec = int(time.time())
+    last = _last
+    if last[0] != sec:
+        stamp = datetime.fromtimestamp(sec, timezone.utc).replace(tzinfo=None).isoformat()
+        last = _last = (sec, stamp)
+    return last[1]
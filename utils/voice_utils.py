@@ -5,7 +5,9 @@ Stoat voice support - NOT YET AVAILABLE
 """
 
 import logging
-from typing import Optional, Dict, Any
+from functools import cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -14,31 +16,37 @@ class VoiceCapability:
     """Detect and handle Stoat voice capabilities"""
 
     # Stoat-only voice features status
-    VOICE_FEATURES = {
-        "stoat": {
+    VOICE_FEATURES = MappingProxyType({
+        "stoat": MappingProxyType({
             "join_channel": False,  # ⏳ Coming in Stoat v1.1+
             "audio_playback": False,
             "voice_effects": False,
             "voice_activity": False,
-        }
-    }
+        })
+    })
 
     @staticmethod
+    @cache
     def is_feature_supported(feature: str) -> bool:
         """Check if feature is supported on Stoat"""
         features = VoiceCapability.VOICE_FEATURES.get("stoat", {})
         return features.get(feature, False)
 
     @staticmethod
-    def get_available_features() -> Dict[str, bool]:
-        """Get all available Stoat voice features"""
+    def get_available_features() -> Mapping[str, bool]:
+        """Get all available Stoat voice features (read-only)"""
         return VoiceCapability.VOICE_FEATURES.get("stoat", {})
 
     @staticmethod
-    def get_unsupported_features() -> list:
-        """Get list of unsupported Stoat voice features"""
-        features = VoiceCapability.get_available_features()
-        return [f for f, supported in features.items() if not supported]
+    def get_unsupported_features() -> Tuple[str, ...]:
+        """Get unsupported Stoat voice features"""
+        return _UNSUPPORTED
+
+
+# The capability table is static, so this is computed once
+_UNSUPPORTED: Tuple[str, ...] = tuple(
+    f for f, supported in VoiceCapability.VOICE_FEATURES["stoat"].items() if not supported
+)
 
 
 class VoiceNotAvailable(Exception):
@@ -53,65 +61,91 @@ class VoiceNotAvailable(Exception):
         )
 
 
+# Replies for unsupported features, keyed by feature name
+_FALLBACK_MESSAGES: Mapping[str, str] = MappingProxyType({
+    "join_channel": (
+        "🎤 Voice channel joining is not yet supported on Stoat.\n"
+        "However, you can queue music using `/play` command!\n"
+        "This feature is coming in Stoat v1.1+"
+    ),
+    "audio_playback": (
+        "🔊 Audio playback is not yet supported on Stoat.\n"
+        "Queued tracks are stored and can be viewed with `/queue`.\n"
+        "Coming soon!"
+    ),
+    "pause": (
+        "⏸️ Pause/resume will be available when voice support is added.\n"
+        "Use `/skip` and `/clear` commands for now."
+    ),
+    "volume": (
+        "🔉 Volume control is not yet available on Stoat.\n"
+        "This will be added when voice support is implemented."
+    ),
+    "effects": (
+        "🎚️ Voice effects are not available in text mode.\n"
+        "Use text-based commands for music management."
+    ),
+})
+
+_FALLBACK_TITLE = "Feature Not Available"
+_FALLBACK_COLOR = 0xFFA500
+_FALLBACK_FOOTER = "🔄 Planned for Stoat v1.1+"
+
+# Default-styled fallback embeds for the known features, built once
+_FALLBACK_EMBEDS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    feature: MappingProxyType({
+        "title": f"⚠️ {_FALLBACK_TITLE}",
+        "description": message,
+        "color": _FALLBACK_COLOR,
+    })
+    for feature, message in _FALLBACK_MESSAGES.items()
+})
+
+
 class VoiceFallback:
     """Fallback implementations for unsupported Stoat voice features"""
 
     @staticmethod
     def get_fallback_message(feature: str) -> str:
         """Get fallback message for unsupported feature"""
-        fallbacks = {
-            "join_channel": (
-                "🎤 Voice channel joining is not yet supported on Stoat.\n"
-                "However, you can queue music using `/play` command!\n"
-                "This feature is coming in Stoat v1.1+"
-            ),
-            "audio_playback": (
-                "🔊 Audio playback is not yet supported on Stoat.\n"
-                "Queued tracks are stored and can be viewed with `/queue`.\n"
-                "Coming soon!"
-            ),
-            "pause": (
-                "⏸️ Pause/resume will be available when voice support is added.\n"
-                "Use `/skip` and `/clear` commands for now."
-            ),
-            "volume": (
-                "🔉 Volume control is not yet available on Stoat.\n"
-                "This will be added when voice support is implemented."
-            ),
-            "effects": (
-                "🎚️ Voice effects are not available in text mode.\n"
-                "Use text-based commands for music management."
-            ),
-        }
-        return fallbacks.get(feature, f"{feature} is not currently available on Stoat.")
+        message = _FALLBACK_MESSAGES.get(feature)
+        if message is None:
+            message = f"{feature} is not currently available on Stoat."
+        return message
 
     @staticmethod
     def create_fallback_embed(
         feature: str,
-        title: str = "Feature Not Available",
-        color: int = 0xFFA500
+        title: str = _FALLBACK_TITLE,
+        color: int = _FALLBACK_COLOR
     ) -> Dict[str, Any]:
         """Create embed for unsupported feature"""
-        message = VoiceFallback.get_fallback_message(feature)
+        if title == _FALLBACK_TITLE and color == _FALLBACK_COLOR:
+            embed = _FALLBACK_EMBEDS.get(feature)
+            if embed is not None:
+                return {**embed, "footer": {"text": _FALLBACK_FOOTER}}
+
         return {
             "title": f"⚠️ {title}",
-            "description": message,
+            "description": VoiceFallback.get_fallback_message(feature),
             "color": color,
-            "footer": {"text": "🔄 Planned for Stoat v1.1+"}
+            "footer": {"text": _FALLBACK_FOOTER}
         }
 
 
 class VoiceChannelStub:
     """Stub for voice channel operations (not yet supported on Stoat)"""
 
-    def __init__(self, channel_id: str):
-        self.channel_id = channel_id
-        self._verify_support()
+    # Resolved once at import; the capability table is static
+    _SUPPORTED = VoiceCapability.is_feature_supported("join_channel")
 
-    def _verify_support(self):
-        """Verify voice is supported"""
-        if not VoiceCapability.is_feature_supported("join_channel"):
+    def __new__(cls, channel_id: str):
+        if not cls._SUPPORTED:
             raise VoiceNotAvailable("Voice channel operations")
+        return super().__new__(cls)
+
+    def __init__(self, channel_id: str):
+        self.channel_id = channel_id
 
     async def join(self) -> bool:
         """Join voice channel (stub - not supported)"""
@@ -136,9 +170,4 @@ class VoiceChannelStub:
 
 def check_voice_support() -> Dict[str, bool]:
     """Check Stoat voice support status"""
-    capabilities = {}
-
-    for feature in VoiceCapability.get_available_features():
-        capabilities[feature] = VoiceCapability.is_feature_supported(feature)
-
-    return capabilities
\ No newline at end of file
+    return dict(VoiceCapability.VOICE_FEATURES["stoat"])
\ No newline at end of file
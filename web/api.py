@@ -2,10 +2,168 @@
 REST API for Logiq (Stoat-only)
 """
 
+import asyncio
+import hashlib
 import os
-from fastapi import FastAPI
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Depends, FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
+from fastapi.responses import ORJSONResponse
+
+# Collection counts for /stats, refreshed at most every STATS_CACHE_TTL seconds
+STATS_CACHE_TTL = 10.0
+
+# Serialised /guilds pages: at most GUILDS_CACHE_PAGES, each reused for up
+# to GUILDS_CACHE_TTL seconds so renames and member counts catch up
+GUILDS_CACHE_PAGES = 64
+GUILDS_CACHE_TTL = 30.0
+
+# Fields /guilds returns; excluding _id also keeps ObjectIds out of the JSON
+_GUILD_PROJECTION = {"guild_id": 1, "name": 1, "member_count": 1, "_id": 0}
+
+
+def _format_uptime(bot) -> str:
+    """Uptime as H:MM:SS from the bot's monotonic start time"""
+    start = getattr(bot, 'start_monotonic', None)
+    if start is None:
+        return "Unknown"
+    minutes, seconds = divmod(int(time.monotonic() - start), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+def get_bot(request: Request):
+    """Dependency: the bot instance create_app attached to the app"""
+    return request.app.state.bot
+
+
+router = APIRouter()
+
+
+@router.get("/")
+async def root(response: Response):
+    """Root endpoint"""
+    # Static payload; let clients and proxies reuse it
+    response.headers["Cache-Control"] = "public, max-age=300"
+    response.headers["ETag"] = '"root-v1.0.0"'
+    return {
+        "message": "Logiq Stoat Bot API",
+        "version": "1.0.0",
+        "platform": "Stoat.chat"
+    }
+
+
+@router.get("/stats")
+async def get_stats(request: Request, bot=Depends(get_bot)):
+    """Get bot statistics"""
+    cache = request.app.state.stats_cache
+    if cache["counts"] is None or time.monotonic() - cache["ts"] >= STATS_CACHE_TTL:
+        # Metadata-based counts: O(1), unlike count_documents({})
+        cache["counts"] = await asyncio.gather(
+            bot.db.db.guilds.estimated_document_count(),
+            bot.db.db.users.estimated_document_count()
+        )
+        cache["ts"] = time.monotonic()
+    guilds_count, users_count = cache["counts"]
+
+    return {
+        "guilds": guilds_count,
+        "users": users_count,
+        "platform": "Stoat.chat",
+        "uptime": _format_uptime(bot),
+    }
+
+
+@router.get("/guilds")
+async def get_guilds(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    bot=Depends(get_bot)
+):
+    """Get a page of guilds"""
+    # Serialised pages are reused until they expire or the bot joins or leaves a server
+    cache = request.app.state.guilds_cache
+    version = getattr(bot, 'guilds_version', 0)
+    if cache["version"] != version:
+        cache["version"] = version
+        cache["pages"].clear()
+
+    pages = cache["pages"]
+    key = (skip, limit)
+    now = time.monotonic()
+    cached = pages.get(key)
+    if cached is not None and now - cached[0] < GUILDS_CACHE_TTL:
+        pages.move_to_end(key)
+        body = cached[1]
+    else:
+        # Sorted on the unique guild_id index so pages are stable
+        cursor = (
+            bot.db.db.guilds.find({}, _GUILD_PROJECTION)
+            .sort("guild_id", 1)
+            .skip(skip)
+            .limit(limit)
+            .batch_size(limit)
+        )
+        guilds = [g async for g in cursor]
+        body = orjson.dumps({"guilds": guilds, "count": len(guilds), "skip": skip, "limit": limit})
+        pages[key] = (now, body)
+        pages.move_to_end(key)
+        if len(pages) > GUILDS_CACHE_PAGES:
+            pages.popitem(last=False)
+
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/health")
+async def health(response: Response):
+    """Health check endpoint"""
+    # Short enough that a monitor still notices an outage promptly
+    response.headers["Cache-Control"] = "public, max-age=5"
+    response.headers["ETag"] = '"healthy-v1"'
+    return {"status": "healthy", "platform": "Stoat.chat"}
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """304 response if the request's If-None-Match lists etag, else None"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or etag not in (tag.strip() for tag in if_none_match.split(",")):
+        return None
+    headers = {"ETag": etag}
+    if "cache-control" in response.headers:
+        headers["Cache-Control"] = response.headers["cache-control"]
+    return Response(status_code=304, headers=headers)
+
+
+async def etag_middleware(request: Request, call_next):
+    """Tag GET JSON responses and answer unchanged ones with 304 Not Modified"""
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or not 200 <= response.status_code < 300
+        or not response.headers.get("content-type", "").startswith("application/json")
+    ):
+        return response
+
+    # Routes with a fixed payload set their own ETag; no need to read the body
+    etag = response.headers.get("etag")
+    if etag is not None:
+        return _not_modified(request, response, etag) or response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    not_modified = _not_modified(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    headers = dict(response.headers)
+    headers["etag"] = etag
+    return Response(content=body, status_code=response.status_code, headers=headers)
 
 
 def create_app(bot) -> FastAPI:
@@ -14,49 +172,23 @@ def create_app(bot) -> FastAPI:
     app = FastAPI(
         title="Logiq API",
         description="REST API for Logiq Stoat Bot",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=ORJSONResponse
     )
+    app.state.bot = bot
+    app.state.stats_cache = {"ts": 0.0, "counts": None}
+    app.state.guilds_cache = {"version": None, "pages": OrderedDict()}
 
     cors_origins = bot.config.get('web', {}).get('cors_origins', ['http://localhost:3000'])
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=cors_origins,
+        allow_origins=tuple(cors_origins),
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        # The API is read-only; explicit lists skip the wildcard reflection path
+        allow_methods=("GET", "OPTIONS"),
+        allow_headers=("if-none-match", "content-type", "authorization"),
     )
-
-    @app.get("/")
-    async def root():
-        """Root endpoint"""
-        return {
-            "message": "Logiq Stoat Bot API",
-            "version": "1.0.0",
-            "platform": "Stoat.chat"
-        }
-
-    @app.get("/stats")
-    async def get_stats():
-        """Get bot statistics"""
-        guilds_count = await bot.db.db.guilds.count_documents({})
-        users_count = await bot.db.db.users.count_documents({})
-
-        return {
-            "guilds": guilds_count,
-            "users": users_count,
-            "platform": "Stoat.chat",
-            "uptime": str(datetime.utcnow() - bot.start_time).split('.')[0] if hasattr(bot, 'start_time') else "Unknown",
-        }
-
-    @app.get("/guilds")
-    async def get_guilds():
-        """Get list of guilds"""
-        guilds = await bot.db.db.guilds.find({}).to_list(length=100)
-        return {"guilds": [dict(g) for g in guilds], "count": len(guilds)}
-
-    @app.get("/health")
-    async def health():
-        """Health check endpoint"""
-        return {"status": "healthy", "platform": "Stoat.chat"}
+    app.middleware("http")(etag_middleware)
+    app.include_router(router)
 
     return app